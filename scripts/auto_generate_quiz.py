@@ -20,13 +20,38 @@ import random
 import time
 import re
 import argparse
+import csv
+import functools
+import io
 import os
+import sqlite3
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Tuple, Dict, List
+from datetime import datetime, timedelta
+from typing import Optional, Tuple, Dict, List, NamedTuple
 
-import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limit import PFR_LIMITER as _PFR_LIMITER, TokenBucket
+
+try:
+    import orjson  # Optional: faster quiz serialization
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache  # Optional: on-disk cache for Pro Football Reference pages
+except ImportError:
+    requests_cache = None
+
+try:
+    from PIL import Image  # Optional: downscale headshots before sending to Vision
+except ImportError:
+    Image = None
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -37,6 +62,95 @@ NBA_SAVE_DIR = PROJECT_ROOT / "quizzes" / "starting5" / "preloaded"
 NFL_SAVE_DIR = PROJECT_ROOT / "quizzes" / "gridiron11" / "preloaded"
 COLLEGE_DATA_PATH = PROJECT_ROOT / "app" / "starting5" / "static" / "json" / "cbb25.csv"
 NFL_COLLEGE_DATA_FILE = PROJECT_ROOT / "app" / "gridiron11" / "CFB" / "cbb25.csv"
+CACHE_DIR = PROJECT_ROOT / "scripts" / ".cache"
+NON_COLLEGE_CACHE_PATH = CACHE_DIR / "non_college_players.json"
+PLAYER_INFO_DB_PATH = CACHE_DIR / "player_info.sqlite"
+AVATAR_CACHE_DB_PATH = CACHE_DIR / "avatar_cache.sqlite"
+NFL_PLAYER_META_DB_PATH = CACHE_DIR / "nfl_player_meta.sqlite"
+
+# Avatar matching is a pick-one-of-14 classification with a two-digit answer,
+# so the small fast model is plenty
+AVATAR_MODEL = "claude-haiku-4-5"
+
+def _pfr_cache_expiry() -> dict:
+    """requests-cache URL rules for Pro Football Reference, first match wins."""
+    now = datetime.now()
+    # A season's playoffs run into February, so it's still live until March
+    current_season = now.year - (1 if now.month < 3 else 0)
+    return {
+        f"*.pro-football-reference.com/teams/*/{current_season}.htm": timedelta(hours=12),
+        "*.pro-football-reference.com/teams/": timedelta(days=30),
+        "*.pro-football-reference.com/boxscores/": timedelta(days=30),
+        # Player pages (active players change teams) and anything else
+        "*.pro-football-reference.com": timedelta(days=1),
+    }
+
+
+# Shared HTTP session: keep-alive connection reuse plus exponential backoff on
+# throttling/5xx responses, instead of a fresh TLS handshake per urlopen().
+# Pro Football Reference pages are cached on disk: past seasons' team pages and
+# boxscores never change, so they're kept for 30 days; the current season's
+# team pages for 12 hours and player pages for a day. Other hosts bypass the
+# cache. --no-cache clears it (along with the avatar picks).
+if requests_cache is not None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _SESSION = requests_cache.CachedSession(
+        cache_name=str(CACHE_DIR / "pfr_cache"),
+        backend="sqlite",
+        expire_after=requests_cache.DO_NOT_CACHE,
+        urls_expire_after=_pfr_cache_expiry(),
+        allowable_codes=(200,),
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    ),
+))
+# Headshot CDN: its own keep-alive pool sized for a lineup's parallel downloads,
+# with quick retries since a missing headshot just falls back to random
+_SESSION.mount("https://cdn.nba.com/", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]),
+))
+
+
+def _fetch_bytes(url: str, timeout: float = 10) -> bytes:
+    """GET a URL through the shared session and return the raw body."""
+    response = _SESSION.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def _write_quiz_json(out_path: Path, quiz: dict):
+    """Write a quiz file as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        out_path.write_bytes(orjson.dumps(quiz, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        out_path.write_text(json.dumps(quiz, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+# Pro Football Reference requests share rate_limit.PFR_LIMITER with
+# generate_nfl_quiz.py, paced safely below the site's ban threshold
+
+# stats.nba.com pacing shared by every NBA API call: at most 8 requests per
+# 5 seconds, so calls go out as soon as there's budget instead of after a
+# fixed sleep
+_NBA_LIMITER = TokenBucket(rate=8, per=5.0)
+
+# Worker pool for prefetching pages while the main loop validates players
+_HTTP_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Separate small pool for NBA box score downloads so they never queue behind
+# (or starve) the player-info lookups they trigger on _HTTP_POOL
+_BOXSCORE_POOL = ThreadPoolExecutor(max_workers=3)
 
 # Avatar descriptions for AI matching (skin tone variations in your sprites)
 NBA_AVATAR_DESCRIPTIONS = {
@@ -214,11 +328,14 @@ PRIORITY_PLAYER_AVATARS = {
     "jokic": "14",
 }
 
+# Normalized once at import so hand-edited keys with stray capitals or spaces
+# still match the lowercased, stripped lookup
+_PRIORITY = {k.lower().strip(): v for k, v in PRIORITY_PLAYER_AVATARS.items()}
+
 
 def get_priority_avatar(player_name: str) -> str | None:
     """Check if a player has a priority avatar assignment."""
-    name_lower = player_name.lower().strip()
-    return PRIORITY_PLAYER_AVATARS.get(name_lower)
+    return _PRIORITY.get(player_name.lower().strip())
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -230,288 +347,294 @@ def get_nba_headshot_url(player_id: int) -> str:
     return f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player_id}.png"
 
 
-def get_nfl_headshot_url(player_profile_url: str) -> str | None:
-    """Extract NFL player headshot URL from their Pro Football Reference profile page."""
+_HEADSHOT_FUTURES = {}
+_HEADSHOT_FUTURES_LOCK = threading.Lock()  # Parallel quiz searches share the map
+
+
+def prefetch_headshots(urls: list):
+    """Start downloading headshots on the worker pool ahead of the vision calls."""
+    with _HEADSHOT_FUTURES_LOCK:
+        for url in urls:
+            if url and url not in _HEADSHOT_FUTURES:
+                _HEADSHOT_FUTURES[url] = _HTTP_POOL.submit(_download_headshot, url)
+
+
+def _download_headshot(url: str) -> tuple:
+    return _shrink_headshot(_fetch_bytes(url))
+
+
+def _shrink_headshot(raw: bytes) -> tuple:
+    """
+    Fit a headshot within 1092x1092 (~1.15MP, the Vision API's no-resize size)
+    and re-encode it as JPEG. Returns (bytes, "image/jpeg"), or (raw, None) when
+    Pillow isn't installed or the image can't be decoded.
+    """
+    if Image is None:
+        return raw, None
     try:
-        from urllib.request import Request, urlopen
-        from bs4 import BeautifulSoup
-        
-        req = Request(player_profile_url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req, timeout=10).read().decode("utf-8")
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Find the player headshot in the media-item div
-        media_item = soup.select_one("#meta .media-item img")
-        if media_item and media_item.get("src"):
-            return media_item["src"]
-        
-        # Fallback: look for any image in the meta section
-        meta_img = soup.select_one("#meta img")
-        if meta_img and meta_img.get("src"):
-            return meta_img["src"]
-            
-    except Exception as e:
-        print(f"⚠️ Could not get headshot URL: {e}")
-    
-    return None
+        img = Image.open(io.BytesIO(raw))
+        img.thumbnail((1092, 1092), Image.LANCZOS)
+        if img.mode in ("RGBA", "LA", "P"):
+            # Headshots have transparent backgrounds; flatten onto white rather
+            # than letting convert("RGB") turn them black
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=85)
+        return buf.getvalue(), "image/jpeg"
+    except Exception:
+        return raw, None
+
+
+def fetch_headshot(url: str) -> tuple:
+    """
+    Return (image bytes, media type override) for a headshot, using a prefetched
+    download when one was started. The override is None if the original bytes
+    were kept.
+    """
+    with _HEADSHOT_FUTURES_LOCK:
+        future = _HEADSHOT_FUTURES.pop(url, None)
+    if future is not None:
+        return future.result()
+    return _download_headshot(url)
 
 
 def load_avatar_images_as_base64(team_abbr: str, is_nba: bool = True) -> dict:
     """Load avatar images and convert to base64 for vision API."""
+    return dict(_load_avatar_images_cached(team_abbr, is_nba))
+
+
+@functools.lru_cache(maxsize=64)
+def _load_avatar_images_cached(team_abbr: str, is_nba: bool) -> tuple:
+    """Read and encode a team's avatars once per run, as (number, base64) pairs."""
     import base64
     
-    avatars = {}
-    
     if is_nba:
-        avatar_dir = PROJECT_ROOT / "app" / "starting5" / "static" / team_abbr / "images"
-        for i in range(1, 15):  # Avatars 01-14
-            avatar_num = f"{i:02d}"
-            avatar_path = avatar_dir / f"{team_abbr}_{avatar_num}.gif"
-            if avatar_path.exists():
-                with open(avatar_path, "rb") as f:
-                    avatars[avatar_num] = base64.standard_b64encode(f.read()).decode("utf-8")
+        team_dir = PROJECT_ROOT / "app" / "starting5" / "static" / team_abbr
+        file_pattern, count = f"{team_abbr}_{{num}}.gif", 14  # Avatars 01-14
     else:
-        avatar_dir = PROJECT_ROOT / "app" / "gridiron11" / "Sprites" / team_abbr / "images"
-        for i in range(1, 11):  # Avatars 01-10
-            avatar_num = f"{i:02d}"
-            avatar_path = avatar_dir / f"{team_abbr.lower()}_{avatar_num}.png"
-            if avatar_path.exists():
-                with open(avatar_path, "rb") as f:
-                    avatars[avatar_num] = base64.standard_b64encode(f.read()).decode("utf-8")
+        team_dir = PROJECT_ROOT / "app" / "gridiron11" / "Sprites" / team_abbr
+        file_pattern, count = f"{team_abbr.lower()}_{{num}}.png", 10  # Avatars 01-10
+    
+    # Prebuilt manifest from build_avatar_manifest.py: one read instead of one per sprite
+    manifest_path = team_dir / "avatars.json"
+    if manifest_path.exists():
+        try:
+            return tuple(sorted(json.loads(manifest_path.read_text(encoding="utf-8")).items()))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read avatar manifest for {team_abbr}: {e}")
+    
+    avatars = {}
+    avatar_dir = team_dir / "images"
+    for i in range(1, count + 1):
+        avatar_num = f"{i:02d}"
+        avatar_path = avatar_dir / file_pattern.format(num=avatar_num)
+        if avatar_path.exists():
+            with open(avatar_path, "rb") as f:
+                avatars[avatar_num] = base64.standard_b64encode(f.read()).decode("utf-8")
     
-    return avatars
+    return tuple(avatars.items())
+
+
+def _load_avatar_cache() -> dict:
+    """Load previous vision avatar picks keyed by (player_key, team)."""
+    if not AVATAR_CACHE_DB_PATH.exists():
+        return {}
+    try:
+        conn = sqlite3.connect(AVATAR_CACHE_DB_PATH)
+        try:
+            rows = conn.execute("SELECT player_key, team, avatar FROM avatar_cache").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not read avatar cache: {e}")
+        return {}
+    return {(player_key, team): avatar for player_key, team, avatar in rows}
+
 
+# A player's look doesn't change between runs, so vision picks are reused
+# per (player, team avatar set); cleared by --no-cache to force fresh picks
+_AVATAR_CACHE = _load_avatar_cache()
 
-def get_ai_avatar_selection_with_vision(player_name: str, team_abbr: str, is_nba: bool = True, 
-                                        player_id: int = None, headshot_url: str = None,
-                                        used_avatars: set = None) -> str:
+
+def _avatar_cache_key(player_name: str, is_nba: bool, player_id: int = None) -> str:
+    if is_nba and player_id:
+        return f"nba:{player_id}"
+    return f"{'nba' if is_nba else 'nfl'}:{player_name.lower()}"
+
+
+def _cached_avatar(player_key: str, team_abbr: str, used_avatars: set) -> str | None:
+    """Return the cached avatar for a player if it isn't already taken in this lineup."""
+    avatar = _AVATAR_CACHE.get((player_key, team_abbr))
+    if avatar and avatar not in used_avatars:
+        return avatar
+    return None
+
+
+def _remember_avatar(player_key: str, team_abbr: str, avatar: str):
+    """Persist a vision avatar pick so later runs skip the API call."""
+    _AVATAR_CACHE[(player_key, team_abbr)] = avatar
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(AVATAR_CACHE_DB_PATH)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS avatar_cache ("
+                "player_key TEXT, team TEXT, avatar TEXT, PRIMARY KEY (player_key, team))"
+            )
+            conn.execute("INSERT OR REPLACE INTO avatar_cache VALUES (?, ?, ?)", (player_key, team_abbr, avatar))
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not persist avatar cache: {e}")
+
+
+def get_ai_avatar_selections_batch(players: list, team_abbr: str, is_nba: bool = True,
+                                   used_avatars: set = None) -> dict:
     """
-    Use Claude Vision to compare player headshot with avatar options.
-    Avoids reusing avatars unless necessary.
+    Match a whole lineup to avatars with a single Claude Vision request.
+    
+    The team's avatar images are uploaded once alongside every player's headshot,
+    and Claude returns a JSON mapping of player name to avatar number. Players the
+    response doesn't cover fall back to random unused avatars.
     
     Args:
-        player_name: Player's name
+        players: Dicts with "name" plus "player_id" (NBA) or "headshot_url" (NFL)
         team_abbr: Team abbreviation (normalized)
         is_nba: True for NBA, False for NFL
-        player_id: NBA player ID (for NBA headshots)
-        headshot_url: Direct URL to player headshot (for NFL)
-        used_avatars: Set of already-used avatar numbers
+        used_avatars: Avatar numbers already taken (e.g. by priority players)
+    
+    Returns:
+        Dict mapping player name to two-digit avatar number
     """
-    if used_avatars is None:
-        used_avatars = set()
-    try:
-        import anthropic
-        import base64
-        import urllib.request
-        
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            print(f"⚠️ No ANTHROPIC_API_KEY, using random avatar for {player_name}")
-            max_avatar = 14 if is_nba else 10
-            return f"{random.randint(1, max_avatar):02d}"
-        
-        client = anthropic.Anthropic(api_key=api_key)
-        
-        # Load avatar images
-        all_avatars = load_avatar_images_as_base64(team_abbr, is_nba)
-        if not all_avatars:
-            print(f"⚠️ No avatars found for {team_abbr}, using random")
-            max_avatar = 14 if is_nba else 10
-            return f"{random.randint(1, max_avatar):02d}"
-        
-        # Filter out already-used avatars (unless we've used them all)
-        available_avatars = {k: v for k, v in all_avatars.items() if k not in used_avatars}
-        if not available_avatars:
-            # All avatars used, allow reuse
-            print(f"ℹ️ All avatars used, allowing reuse for {player_name}")
-            available_avatars = all_avatars
-        
-        avatars = available_avatars
-        
-        # Get player headshot URL
-        if is_nba and player_id:
-            fetch_url = get_nba_headshot_url(player_id)
-            media_type = "image/png"
-        elif headshot_url:
-            fetch_url = headshot_url
-            # Determine media type from URL
-            media_type = "image/jpeg" if headshot_url.lower().endswith(".jpg") else "image/png"
-        else:
-            print(f"⚠️ No headshot source for {player_name}, using random")
-            return random.choice(list(avatars.keys()))
-        
-        # Fetch player headshot
+    used = set(used_avatars or ())
+    selections = {}
+    
+    for p in players:
+        cached = _cached_avatar(_avatar_cache_key(p["name"], is_nba, p.get("player_id")), team_abbr, used)
+        if cached:
+            print(f"💾 Cached avatar for {p['name']} → Avatar {cached}")
+            selections[p["name"]] = cached
+            used.add(cached)
+    
+    remaining = [p for p in players if p["name"] not in selections]
+    if remaining:
         try:
-            req = urllib.request.Request(fetch_url, headers={"User-Agent": "Mozilla/5.0"})
-            with urllib.request.urlopen(req, timeout=10) as response:
-                player_image_data = base64.standard_b64encode(response.read()).decode("utf-8")
+            selections.update(_request_avatar_batch(remaining, team_abbr, is_nba, used))
         except Exception as e:
-            print(f"⚠️ Could not fetch headshot for {player_name}: {e}, using random")
-            return random.choice(list(avatars.keys()))
-        
-        league = "NBA" if is_nba else "NFL"
-        avatar_media_type = "image/gif" if is_nba else "image/png"
-        
-        # Build message with images
-        content = [
-            {
-                "type": "text",
-                "text": f"I need you to match this {league} player ({player_name}) to the best pixel art avatar based on their appearance (skin tone, facial hair, hair style, etc.).\n\nHere is the player's photo:"
-            },
-            {
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": media_type,
-                    "data": player_image_data
-                }
-            },
-            {
-                "type": "text",
-                "text": "Here are the available avatar options:"
-            }
-        ]
-        
-        # Add avatar images
-        for avatar_num, avatar_data in sorted(avatars.items()):
-            content.append({
-                "type": "text",
-                "text": f"Avatar #{avatar_num}:"
-            })
-            content.append({
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": avatar_media_type,
-                    "data": avatar_data
-                }
-            })
-        
-        # Build available avatar list for prompt
-        available_nums = sorted(avatars.keys())
-        available_list = ", ".join(available_nums)
-        
-        content.append({
-            "type": "text",
-            "text": f"Which avatar best matches {player_name}'s appearance? Consider skin tone, hair style, and facial hair.\n\nAVAILABLE OPTIONS: {available_list}\n\nIMPORTANT: Respond with ONLY a two-digit number from the available options. No explanation, no words, just the number."
-        })
-        
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=5,
-            messages=[{"role": "user", "content": content}]
-        )
-        
-        response = message.content[0].text.strip()
-        
-        # Try to extract any number from the response
-        match = re.search(r'(\d{1,2})', response)
-        if match:
-            num = match.group(1).zfill(2)
-            if num in avatars:
-                print(f"👁️ Vision AI matched {player_name} → Avatar {num}")
-                return num
-        
-        # Check if response is directly a valid avatar
-        if response in avatars:
-            print(f"👁️ Vision AI matched {player_name} → Avatar {response}")
-            return response
-        
-        print(f"⚠️ Could not parse vision response '{response[:50]}...', using random for {player_name}")
-        
-    except Exception as e:
-        print(f"⚠️ Vision AI error for {player_name}: {e}, using random")
+            print(f"⚠️ Vision AI batch error for {team_abbr}: {e}, using random")
     
-    # Fallback to random
-    max_avatar = 14 if is_nba else 10
-    return f"{random.randint(1, max_avatar):02d}"
-
-
-def get_ai_avatar_selection(player_name: str, team: str, is_nba: bool = True, player_id: int = None, 
-                            headshot_url: str = None, used_avatars: set = None) -> str:
-    """
-    Use Claude AI to select the most appropriate avatar for a player.
-    If player_id or headshot_url is provided, uses vision API for better matching.
-    Falls back to random selection if AI is unavailable.
-    Tracks used_avatars to avoid duplicates when possible.
-    """
-    if used_avatars is None:
-        used_avatars = set()
-    
-    # Use vision-based selection if we have image source
-    if player_id or headshot_url:
-        return get_ai_avatar_selection_with_vision(
-            player_name, team, is_nba, 
-            player_id=player_id, 
-            headshot_url=headshot_url,
-            used_avatars=used_avatars
-        )
-    
-    # Fallback to text-based selection
-    try:
-        import anthropic
-        
+    # Fallback: deal distinct unused avatars to anyone left unmatched, only
+    # reusing avatars once the unused pool runs out
+    unmatched = [p["name"] for p in players if p["name"] not in selections]
+    if unmatched:
         max_avatar = 14 if is_nba else 10
         all_options = [f"{i:02d}" for i in range(1, max_avatar + 1)]
-        
-        # Filter out used avatars
-        available_options = [opt for opt in all_options if opt not in used_avatars]
-        if not available_options:
-            print(f"ℹ️ All avatars used, allowing reuse for {player_name}")
-            available_options = all_options
-        
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            print(f"⚠️ No ANTHROPIC_API_KEY, using random avatar for {player_name}")
-            return random.choice(available_options)
-        
-        client = anthropic.Anthropic(api_key=api_key)
-        
-        available_list = ", ".join(available_options)
-        
-        prompt = f"""You are helping select an 8-bit pixel art avatar for an {'NBA' if is_nba else 'NFL'} player.
-
-Player: {player_name}
-Team: {team}
-
-Based on your knowledge of what {player_name} looks like (skin tone, facial hair, hair style), 
-pick from these AVAILABLE options: {available_list}
-
-General guide:
-- 01-04: Darker skin tones with various hair/beard styles
-- 05-08: Medium skin tones
-- 09-12: Various styles
-- 13-14: Light skin tones
+        available = [o for o in all_options if o not in used]
+        picks = random.sample(available, k=min(len(unmatched), len(available)))
+        picks += random.choices(all_options, k=len(unmatched) - len(picks))
+        selections.update(zip(unmatched, picks))
+    
+    return selections
 
-Reply with ONLY the two-digit number (e.g., "07"). Nothing else."""
 
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=10,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response = message.content[0].text.strip()
-        
-        # Validate response is from available options
-        match = re.search(r'(\d{1,2})', response)
-        if match:
-            result = f"{int(match.group(1)):02d}"
-            if result in available_options:
-                print(f"🤖 AI selected avatar {result} for {player_name}")
-                return result
-        
-        print(f"⚠️ Invalid AI response '{response}', using random for {player_name}")
-        return random.choice(available_options)
-        
-    except Exception as e:
-        print(f"⚠️ AI error for {player_name}: {e}, using random")
+def _request_avatar_batch(players: list, team_abbr: str, is_nba: bool, used: set) -> dict:
+    """Send one vision request for the lineup; adds accepted picks to `used`."""
+    import anthropic
+    import base64
+    
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        print(f"⚠️ No ANTHROPIC_API_KEY, using random avatars for {team_abbr}")
+        return {}
+    
+    all_avatars = load_avatar_images_as_base64(team_abbr, is_nba)
+    if not all_avatars:
+        print(f"⚠️ No avatars found for {team_abbr}, using random")
+        return {}
     
-    # Fallback to random from available options
-    max_avatar = 14 if is_nba else 10
-    all_opts = [f"{i:02d}" for i in range(1, max_avatar + 1)]
-    available = [o for o in all_opts if o not in used_avatars] or all_opts
-    return random.choice(available)
+    avatars = {k: v for k, v in all_avatars.items() if k not in used}
+    if len(avatars) < len(players):
+        print(f"ℹ️ Not enough unused avatars for {team_abbr}, allowing reuse")
+        avatars = all_avatars
+    
+    # Resolve headshot URLs and download them all concurrently
+    sources = {}
+    for p in players:
+        if is_nba and p.get("player_id"):
+            sources[p["name"]] = (get_nba_headshot_url(p["player_id"]), "image/png")
+        elif p.get("headshot_url"):
+            url = p["headshot_url"]
+            sources[p["name"]] = (url, "image/jpeg" if url.lower().endswith(".jpg") else "image/png")
+    prefetch_headshots([url for url, _ in sources.values()])
+    
+    league = "NBA" if is_nba else "NFL"
+    content = [{
+        "type": "text",
+        "text": f"I need you to match each of these {league} players to the best pixel art avatar based on their appearance (skin tone, facial hair, hair style, etc.).\n\nHere are the players' photos:"
+    }]
+    
+    pictured = []
+    for name, (url, media_type) in sources.items():
+        try:
+            image_bytes, converted_type = fetch_headshot(url)
+            image_data = base64.standard_b64encode(image_bytes).decode("utf-8")
+            media_type = converted_type or media_type
+        except Exception as e:
+            print(f"⚠️ Could not fetch headshot for {name}: {e}, using random")
+            continue
+        pictured.append(name)
+        content.append({"type": "text", "text": f"Player: {name}"})
+        content.append({
+            "type": "image",
+            "source": {"type": "base64", "media_type": media_type, "data": image_data}
+        })
+    
+    if not pictured:
+        return {}
+    
+    content.append({"type": "text", "text": "Here are the available avatar options:"})
+    avatar_media_type = "image/gif" if is_nba else "image/png"
+    for avatar_num, avatar_data in sorted(avatars.items()):
+        content.append({"type": "text", "text": f"Avatar #{avatar_num}:"})
+        content.append({
+            "type": "image",
+            "source": {"type": "base64", "media_type": avatar_media_type, "data": avatar_data}
+        })
+    
+    available_list = ", ".join(sorted(avatars.keys()))
+    already_used = ", ".join(sorted(used)) or "none"
+    content.append({
+        "type": "text",
+        "text": f"Which avatar best matches each player's appearance? Consider skin tone, hair style, and facial hair. Use each avatar at most once.\n\nAVAILABLE OPTIONS: {available_list}\nALREADY USED: {already_used}\n\nIMPORTANT: Respond with ONLY a JSON object mapping each player name exactly as given to a two-digit avatar number, e.g. {{\"{pictured[0]}\": \"07\"}}. No explanation."
+    })
+    
+    client = anthropic.Anthropic(api_key=api_key)
+    message = client.messages.create(
+        model=AVATAR_MODEL,
+        max_tokens=20 + 20 * len(pictured),
+        temperature=0,
+        messages=[{"role": "user", "content": content}]
+    )
+    
+    response = message.content[0].text.strip()
+    match = re.search(r"\{.*\}", response, re.S)
+    mapping = json.loads(match.group(0)) if match else {}
+    
+    player_ids = {p["name"]: p.get("player_id") for p in players}
+    selections = {}
+    for name in pictured:
+        num = str(mapping.get(name, "")).strip().zfill(2)
+        if num in avatars and (num not in used or avatars is all_avatars):
+            selections[name] = num
+            used.add(num)
+            print(f"👁️ Vision AI matched {name} → Avatar {num}")
+            _remember_avatar(_avatar_cache_key(name, is_nba, player_ids[name]), team_abbr, num)
+    
+    return selections
 
 
 def get_skin_tone_based_avatar(player_name: str, is_nba: bool = True) -> str:
@@ -528,96 +651,270 @@ def get_skin_tone_based_avatar(player_name: str, is_nba: bool = True) -> str:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def load_college_data():
-    """Load and process college data."""
+    """Load college rows as dicts with Official/Common/Conference keys."""
     try:
-        df_d1 = pd.read_csv(COLLEGE_DATA_PATH)
-        df_d1 = df_d1.rename(columns={"School": "Official", "Common name": "Common", "Primary": "Conference"})
-        return df_d1
+        # A few hundred rows, three columns used: plain csv beats importing pandas
+        with open(COLLEGE_DATA_PATH, newline="", encoding="utf-8") as f:
+            return [
+                {"Official": row["School"], "Common": row["Common name"], "Conference": row["Primary"]}
+                for row in csv.DictReader(f)
+            ]
     except Exception as e:
         print(f"❌ Error loading college data: {e}")
         return None
 
 
+# clean_name's substitutions, applied in a single regex pass. Alternatives are
+# tried longest-first, which gives the same result as the old chain of
+# .replace() calls on real school names ("state university of " covers the
+# case where "university of " used to be stripped before "state university").
+# Applied in order, like the original .replace() chain: an earlier substitution
+# can create or consume the text a later one matches (e.g. "st at ohio"), so
+# these can't be folded into a single alternation
+_CLEAN_STEPS = (
+    ("university of ", ""),
+    ("univ. of ", ""),
+    ("state university", "state"),
+    ("university", ""),
+    (" at ", " "),
+    ("the ", ""),
+    ("st.", "state"),
+    ("st ", "state "),
+    ("state.", "state"),
+)
+# Single-character cleanup runs after the substitutions, as it did in the chain
+_CLEAN_TRANS = str.maketrans({"-": " ", ".": None, "(": None, ")": None})
+_WS_RE = re.compile(r"\s+")
+
+
 def clean_name(name):
     """Clean school name for matching."""
     if not isinstance(name, str):
         return ""
-    cleaned = (
-        name.lower()
-        .replace("university of ", "")
-        .replace("univ. of ", "")
-        .replace("state university", "state")
-        .replace("university", "")
-        .replace(" at ", " ")
-        .replace("the ", "")
-        .replace("st.", "state")
-        .replace("st ", "state ")
-        .replace("state.", "state")
-        .replace("-", " ")
-        .replace(".", "")
-        .replace("(", "")
-        .replace(")", "")
-    )
-    return re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = name.lower()
+    for old, new in _CLEAN_STEPS:
+        cleaned = cleaned.replace(old, new)
+    return _WS_RE.sub(" ", cleaned.translate(_CLEAN_TRANS)).strip()
 
 
-def build_college_map(df_d1):
+def build_college_map(colleges):
     """Build a mapping of cleaned names to (common_name, conference)."""
     _cleaned_map = {}
-    for _, row in df_d1.iterrows():
-        cleaned_common = clean_name(row.get("Common", ""))
-        cleaned_official = clean_name(row.get("Official", ""))
-        common = row.get("Common", "")
-        conf = row.get("Conference", "Other")
-        
+    
+    # Later rows win, and within a row the official name overwrites the common one
+    for college in colleges:
+        value = (college["Common"], college["Conference"])
+        cleaned_common = clean_name(college["Common"])
+        cleaned_official = clean_name(college["Official"])
         if cleaned_common:
-            _cleaned_map[cleaned_common] = (common, conf)
+            _cleaned_map[cleaned_common] = value
         if cleaned_official:
-            _cleaned_map[cleaned_official] = (common, conf)
+            _cleaned_map[cleaned_official] = value
     
     return _cleaned_map
 
 
-def match_college_to_conf(school_raw: str, cleaned_map: dict):
+# Substring markers for non-college backgrounds, compiled once so each check is
+# a single scan over the cleaned name
+_HS_RE = re.compile(r"high|prep|academy|charter|school")
+_INTL_RE = re.compile(
+    r"paris|vasco|canada|real madrid|bahamas|belgrade|france|europe|australia|london|international|club"
+)
+
+
+class MatchResult(NamedTuple):
+    """Outcome of matching a raw school name; unpacks like the old 4-tuple."""
+    school: str
+    school_type: str
+    conf: str
+    score: int
+
+
+_UNKNOWN_MATCH = MatchResult("Unknown", "Other", "Other", 0)
+
+
+def match_college_to_conf(school_raw: str, cleaned_map: dict) -> MatchResult:
     """Match a school name to our database."""
     if not school_raw or school_raw.lower().strip() in {"unknown", "none"}:
-        return "Unknown", "Other", "Other", 0
+        return _UNKNOWN_MATCH
 
     cleaned = clean_name(school_raw)
 
     if cleaned in {"southern california", "university of southern california"}:
         school, conf = cleaned_map.get("usc", ("USC", "Other"))
-        return school, "College", conf, 100
+        return MatchResult(school, "College", conf, 100)
 
     if cleaned in cleaned_map:
         school, conf = cleaned_map[cleaned]
-        return school, "College", conf, 100
+        return MatchResult(school, "College", conf, 100)
 
-    if any(w in cleaned for w in ["high", "prep", "academy", "charter", "school"]):
-        return school_raw, "High School", "Other", 0
-    if any(w in cleaned for w in ["paris", "vasco", "canada", "real madrid", "bahamas", "belgrade", "france", "europe", "australia", "london", "international", "club"]):
-        return school_raw, "International", "Other", 0
+    if _HS_RE.search(cleaned):
+        return MatchResult(school_raw, "High School", "Other", 0)
+    if _INTL_RE.search(cleaned):
+        return MatchResult(school_raw, "International", "Other", 0)
     
-    return school_raw, "Other", "Other", 0
+    return MatchResult(school_raw, "Other", "Other", 0)
 
 
-def generate_nba_quiz(count: int = 1) -> int:
-    """Generate NBA quizzes automatically."""
+def _load_known_non_college() -> set:
+    """Load IDs of players previously seen with a high school/international background."""
+    try:
+        return set(json.loads(NON_COLLEGE_CACHE_PATH.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return set()
+
+
+def _load_player_info_cache() -> dict:
+    """Load previously fetched (school, position, country) tuples keyed by player ID."""
+    if not PLAYER_INFO_DB_PATH.exists():
+        return {}
+    try:
+        conn = sqlite3.connect(PLAYER_INFO_DB_PATH)
+        try:
+            rows = conn.execute("SELECT player_id, school, position, country FROM player_info").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not read player info cache: {e}")
+        return {}
+    return {pid: (school, position, country) for pid, school, position, country in rows}
+
+
+_KNOWN_NON_COLLEGE_PLAYERS = _load_known_non_college()
+_PLAYER_INFO_CACHE = _load_player_info_cache()
+_PLAYER_CACHE_LOCK = threading.Lock()
+
+
+def _store_player_info(player_id: int, info: tuple):
+    """Persist a CommonPlayerInfo result so later runs skip the API call."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with _PLAYER_CACHE_LOCK:
+            conn = sqlite3.connect(PLAYER_INFO_DB_PATH)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS player_info ("
+                    "player_id INTEGER PRIMARY KEY, school TEXT, position TEXT, country TEXT, fetched_at REAL)"
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO player_info VALUES (?, ?, ?, ?, ?)",
+                    (player_id, *info, time.time()),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not persist player info cache: {e}")
+
+
+def _remember_non_college(player_id: int):
+    """Blacklist a player so future runs reject their lineups without API calls."""
+    with _PLAYER_CACHE_LOCK:
+        if player_id in _KNOWN_NON_COLLEGE_PLAYERS:
+            return
+        _KNOWN_NON_COLLEGE_PLAYERS.add(player_id)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            NON_COLLEGE_CACHE_PATH.write_text(json.dumps(sorted(_KNOWN_NON_COLLEGE_PLAYERS)), encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️ Could not persist non-college player cache: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def _player_index() -> dict:
+    """Map lowercase full names to nba_api player records (built once per process)."""
     from nba_api.stats.static import players
-    from nba_api.stats.endpoints import (
-        leaguegamelog,
-        boxscoretraditionalv2,
-        boxscoresummaryv2,
-        commonplayerinfo
+    
+    index = {}
+    for p in players.get_players():
+        # Keep the first record for duplicate names, like the old list scan did
+        index.setdefault(p["full_name"].lower(), p)
+    print(f"📇 Indexed {len(index)} NBA players by name")
+    return index
+
+
+def _player_info(player_id: int) -> tuple:
+    """Return (school, position, country) for a player, fetching at most once ever."""
+    cached = _PLAYER_INFO_CACHE.get(player_id)
+    if cached is not None:
+        return cached
+    
+    from nba_api.stats.endpoints import commonplayerinfo
+    
+    _NBA_LIMITER.acquire()
+    info_df = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
+    info = (
+        info_df.iloc[0].get("SCHOOL", "Unknown"),
+        info_df.iloc[0].get("POSITION", "Unknown"),
+        info_df.iloc[0].get("COUNTRY", "Unknown"),
     )
+    _PLAYER_INFO_CACHE[player_id] = info
+    _store_player_info(player_id, info)
+    return info
+
+
+def _fetch_nba_boxscore(game_id: str):
+    """
+    Download a game's box score and summary header.
+    Returns (box score frame, starters frame, header row), or None when the
+    game doesn't list starters for both teams.
+    """
+    from nba_api.stats.endpoints import boxscoretraditionalv2, boxscoresummaryv2
+    
+    _NBA_LIMITER.acquire()
+    df = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id).get_data_frames()[0]
+    starters = df[df["START_POSITION"].notna() & (df["START_POSITION"] != "")]
+    if len(starters["TEAM_ID"].unique()) < 2:
+        return None
     
+    _NBA_LIMITER.acquire()
+    header = boxscoresummaryv2.BoxScoreSummaryV2(game_id=game_id).get_data_frames()[0].iloc[0]
+    return df, starters, header
+
+
+# Independent season searches run at once for --count > 1; the shared rate
+# limiters keep the combined request rate unchanged
+NBA_PARALLEL_SEARCHES = 3
+
+_CLAIMED_GAMES = set()
+_CLAIMED_GAMES_LOCK = threading.Lock()
+
+
+def _claim_game(game_id: str) -> bool:
+    """Reserve a game for one search so parallel searches don't evaluate it twice."""
+    with _CLAIMED_GAMES_LOCK:
+        if game_id in _CLAIMED_GAMES:
+            return False
+        _CLAIMED_GAMES.add(game_id)
+        return True
+
+
+def generate_nba_quiz(count: int = 1) -> int:
+    """Generate NBA quizzes automatically."""
     print(f"🏀 Generating {count} NBA quiz(es)...")
     
-    df_d1 = load_college_data()
-    if df_d1 is None:
+    colleges = load_college_data()
+    if colleges is None:
         return 0
     
-    cleaned_map = build_college_map(df_d1)
+    cleaned_map = build_college_map(colleges)
+    
+    # Split the quota across parallel searches, e.g. 5 -> [2, 2, 1]
+    workers = max(1, min(count, NBA_PARALLEL_SEARCHES))
+    quotas = [count // workers + (1 if i < count % workers else 0) for i in range(workers)]
+    if workers == 1:
+        return _search_nba_quizzes(count, cleaned_map)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(lambda quota: _search_nba_quizzes(quota, cleaned_map), quotas))
+
+
+def _search_nba_quizzes(count: int, cleaned_map: dict) -> int:
+    """Search random seasons until `count` NBA quizzes are saved or attempts run out."""
+    from nba_api.stats.endpoints import leaguegamelog
+    
+    import pandas as pd
+    
     generated = 0
     seasons = [f"{year}-{str(year+1)[-2:]}" for year in range(2010, 2024)]
     
@@ -629,24 +926,32 @@ def generate_nba_quiz(count: int = 1) -> int:
         season = random.choice(seasons)
         print(f"\n--- Attempt {attempts}: Season {season} ---")
         
+        box_futures = {}
         try:
-            time.sleep(1)
+            _NBA_LIMITER.acquire()
             gl = leaguegamelog.LeagueGameLog(season=season, season_type_all_star="Regular Season")
             game_ids = gl.get_data_frames()[0]["GAME_ID"].unique().tolist()
-            random.shuffle(game_ids)
             
-            for game_id in game_ids[:20]:  # Try up to 20 games per season
+            # Try up to 20 random games per season, downloading box scores
+            # concurrently and evaluating each game as soon as its data arrives
+            picked_ids = random.sample(game_ids, k=min(20, len(game_ids)))
+            box_futures = {_BOXSCORE_POOL.submit(_fetch_nba_boxscore, gid): gid for gid in picked_ids}
+            
+            for box_future in as_completed(box_futures):
+                game_id = box_futures[box_future]
+                info_futures = {}
                 try:
-                    time.sleep(0.8)
-                    box = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id)
-                    df = box.get_data_frames()[0]
-                    starters = df[df["START_POSITION"].notna() & (df["START_POSITION"] != "")]
-                    
-                    if len(starters["TEAM_ID"].unique()) < 2:
+                    fetched = box_future.result()
+                    if fetched is None or not _claim_game(game_id):
                         continue
+                    df, starters, header = fetched
+                    
+                    # Split out each team's first five starters and their stat
+                    # totals once per game rather than re-filtering per team
+                    starters = starters.groupby("TEAM_ID", sort=False).head(5)
+                    starters_by_team = dict(tuple(starters.groupby("TEAM_ID", sort=False)))
+                    team_totals = starters.groupby("TEAM_ID")[["PTS", "AST", "REB", "STL", "BLK"]].sum()
                     
-                    summary = boxscoresummaryv2.BoxScoreSummaryV2(game_id=game_id)
-                    header = summary.get_data_frames()[0].iloc[0]
                     home_id, away_id = header["HOME_TEAM_ID"], header["VISITOR_TEAM_ID"]
                     home_abbr_raw = df[df["TEAM_ID"] == home_id]["TEAM_ABBREVIATION"].iloc[0]
                     away_abbr_raw = df[df["TEAM_ID"] == away_id]["TEAM_ABBREVIATION"].iloc[0]
@@ -661,55 +966,107 @@ def generate_nba_quiz(count: int = 1) -> int:
                     except:
                         game_date = str(game_date)
                     
+                    # Fetch player info for both teams' starters up front so that
+                    # if the home lineup fails, the away lineup is already in hand
+                    for name in starters["PLAYER_NAME"]:
+                        match = _player_index().get(name.lower())
+                        if not match:
+                            continue
+                        player_id = match["id"]
+                        if (player_id in _KNOWN_NON_COLLEGE_PLAYERS
+                                or player_id in _PLAYER_INFO_CACHE
+                                or player_id in info_futures):
+                            continue
+                        info_futures[player_id] = _HTTP_POOL.submit(_player_info, player_id)
+                    
                     # Try each team
                     for team_id in [home_id, away_id]:
-                        team_starters = starters[starters["TEAM_ID"] == team_id].head(5)
-                        if len(team_starters) < 5:
+                        team_starters = starters_by_team.get(team_id)
+                        if team_starters is None or len(team_starters) < 5:
                             continue
                         
                         team_abbr_raw = team_starters["TEAM_ABBREVIATION"].iloc[0]
                         team_abbr = normalize_team_abbrev(team_abbr_raw)
                         opp_abbr = away_abbr if team_id == home_id else home_abbr
                         
-                        t_pts = team_starters["PTS"].sum()
-                        t_ast = team_starters["AST"].sum()
-                        t_reb = team_starters["REB"].sum()
-                        t_def = team_starters["STL"].sum() + team_starters["BLK"].sum()
+                        # Contribution percentages for the whole lineup in one
+                        # vectorized pass instead of per-player scalar math
+                        totals = team_totals.loc[team_id]
+                        t_def = totals["STL"] + totals["BLK"]
+                        team_starters = team_starters.assign(
+                            points_pct=(team_starters["PTS"] / totals["PTS"]).round(3) if totals["PTS"] else 0,
+                            assists_pct=(team_starters["AST"] / totals["AST"]).round(3) if totals["AST"] else 0,
+                            rebounds_pct=(team_starters["REB"] / totals["REB"]).round(3) if totals["REB"] else 0,
+                            defense_pct=((team_starters["STL"] + team_starters["BLK"]) / t_def).round(3) if t_def else 0,
+                        )
                         
-                        # Check all players have valid colleges
-                        player_rows = []
-                        lineup_valid = True
-                        
-                        for _, row in team_starters.iterrows():
-                            name = row["PLAYER_NAME"]
-                            
-                            # Get player info
-                            match = [p for p in players.get_players() if p["full_name"].lower() == name.lower()]
+                        # Precheck: resolve player IDs and reject lineups we already
+                        # know are invalid (blacklisted or cached non-college players)
+                        # before spending any API calls
+                        lineup_ids = []
+                        for name in team_starters["PLAYER_NAME"]:
+                            match = _player_index().get(name.lower())
                             if not match:
-                                lineup_valid = False
                                 break
                             
-                            player_id = match[0]["id"]
-                            time.sleep(0.6)
+                            player_id = match["id"]
+                            if player_id in _KNOWN_NON_COLLEGE_PLAYERS:
+                                break
+                            
+                            cached = _PLAYER_INFO_CACHE.get(player_id)
+                            if cached and match_college_to_conf(cached[0], cleaned_map).school_type != "College":
+                                break
                             
+                            lineup_ids.append(player_id)
+                        
+                        if len(lineup_ids) < len(team_starters):
+                            continue
+                        
+                        # Check all players have valid colleges, in whatever order
+                        # their lookups finish, so one bad player rejects the
+                        # lineup without waiting on the others
+                        team_futures = {}
+                        for player_id in lineup_ids:
+                            if player_id not in info_futures:
+                                info_futures[player_id] = _HTTP_POOL.submit(_player_info, player_id)
+                            team_futures[info_futures[player_id]] = player_id
+                        
+                        resolved = {}
+                        lineup_valid = True
+                        for future in as_completed(team_futures):
+                            player_id = team_futures[future]
                             try:
-                                info_df = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
-                                school_raw = info_df.iloc[0].get("SCHOOL", "Unknown")
-                                position = info_df.iloc[0].get("POSITION", "Unknown")
-                                country = info_df.iloc[0].get("COUNTRY", "Unknown")
+                                school_raw, position, country = future.result()
                             except:
                                 lineup_valid = False
                                 break
                             
                             school, school_type, conf, score = match_college_to_conf(school_raw, cleaned_map)
                             
+                            if school_type in ("High School", "International"):
+                                _remember_non_college(player_id)
+                            
                             if school_type != "College" or score < 100:
                                 lineup_valid = False
                                 break
                             
+                            resolved[player_id] = (school, school_type, conf, position, country)
+                        
+                        if not lineup_valid:
+                            for future in team_futures:
+                                future.cancel()
+                            continue
+                        
+                        lineup_cols = [
+                            "PLAYER_NAME", "PTS", "AST", "REB", "STL", "BLK",
+                            "points_pct", "assists_pct", "rebounds_pct", "defense_pct",
+                        ]
+                        player_rows = []
+                        for row, player_id in zip(team_starters[lineup_cols].itertuples(index=False), lineup_ids):
+                            school, school_type, conf, position, country = resolved[player_id]
                             player_rows.append({
                                 "row": row,
-                                "name": name,
+                                "name": row.PLAYER_NAME,
                                 "school": school,
                                 "school_type": school_type,
                                 "conf": conf,
@@ -718,7 +1075,7 @@ def generate_nba_quiz(count: int = 1) -> int:
                                 "country": country,
                             })
                         
-                        if not lineup_valid or len(player_rows) < 5:
+                        if len(player_rows) < 5:
                             continue
                         
                         # Build quiz with AI avatar selection
@@ -744,24 +1101,17 @@ def generate_nba_quiz(count: int = 1) -> int:
                                 used_avatars.add(priority_avatar)
                                 print(f"⭐ Priority match: {name} → Avatar {priority_avatar}")
                         
-                        # PHASE 2: AI selection for remaining players
+                        # PHASE 2: One vision request matches all remaining players
+                        player_avatars.update(get_ai_avatar_selections_batch(
+                            [{"name": pr["name"], "player_id": pr["player_id"]}
+                             for pr in player_rows if pr["name"] not in player_avatars],
+                            team_abbr, is_nba=True, used_avatars=used_avatars
+                        ))
+                        
                         for pr in player_rows:
                             row = pr["row"]
                             name = pr["name"]
-                            
-                            # Check if already assigned in priority phase
-                            if name in player_avatars:
-                                avatar = player_avatars[name]
-                            else:
-                                # AI avatar selection with vision (avoids duplicates)
-                                avatar = get_ai_avatar_selection(name, team_abbr, is_nba=True, player_id=pr["player_id"], used_avatars=used_avatars)
-                                used_avatars.add(avatar)  # Mark as used
-                            
-                            pts = row["PTS"]
-                            ast = row["AST"]
-                            reb = row["REB"]
-                            stl = row["STL"]
-                            blk = row["BLK"]
+                            avatar = player_avatars[name]
                             
                             quiz["players"].append({
                                 "name": name,
@@ -775,17 +1125,17 @@ def generate_nba_quiz(count: int = 1) -> int:
                                 "position": pr["position"],
                                 "country": pr["country"],
                                 "game_stats": {
-                                    "pts": int(pts),
-                                    "ast": int(ast),
-                                    "reb": int(reb),
-                                    "stl": int(stl),
-                                    "blk": int(blk),
+                                    "pts": int(row.PTS),
+                                    "ast": int(row.AST),
+                                    "reb": int(row.REB),
+                                    "stl": int(row.STL),
+                                    "blk": int(row.BLK),
                                 },
                                 "game_contribution_pct": {
-                                    "points_pct": round(pts / t_pts, 3) if t_pts else 0,
-                                    "assists_pct": round(ast / t_ast, 3) if t_ast else 0,
-                                    "rebounds_pct": round(reb / t_reb, 3) if t_reb else 0,
-                                    "defense_pct": round((stl + blk) / t_def, 3) if t_def else 0,
+                                    "points_pct": row.points_pct,
+                                    "assists_pct": row.assists_pct,
+                                    "rebounds_pct": row.rebounds_pct,
+                                    "defense_pct": row.defense_pct,
                                 },
                             })
                         
@@ -794,8 +1144,7 @@ def generate_nba_quiz(count: int = 1) -> int:
                         fname = f"{season}_{game_id}_{team_abbr}.json"
                         out_path = NBA_SAVE_DIR / fname
                         
-                        with out_path.open("w", encoding="utf-8") as f:
-                            json.dump(quiz, f, indent=2, ensure_ascii=False)
+                        _write_quiz_json(out_path, quiz)
                         
                         generated += 1
                         progress = f"[{generated}/{count}]"
@@ -811,10 +1160,18 @@ def generate_nba_quiz(count: int = 1) -> int:
                 except Exception as e:
                     print(f"⚠️ Error processing game {game_id}: {e}")
                     continue
+                finally:
+                    # Drop lookups that are still queued once this game is decided
+                    for f in info_futures.values():
+                        f.cancel()
                     
         except Exception as e:
             print(f"⚠️ Error with season {season}: {e}")
             continue
+        finally:
+            # Stop queued box score downloads once we're done with this season
+            for f in box_futures:
+                f.cancel()
     
     return generated
 
@@ -837,17 +1194,147 @@ BROWSER_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
+    # Only advertise encodings urllib3 can decode: "br" is added when the
+    # brotli package is installed, otherwise PFR could send undecodable bodies
+    "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING,
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
 }
 
 
+# Box score starters tables ship inside HTML comments; pull the <table> out of
+# the raw page instead of parsing the document and scanning every comment node.
+# The tempered dot keeps each match inside a single comment.
+_STARTERS_RE = {
+    table_id: re.compile(rf'<!--(?:(?!-->).)*?(<table[^>]*\bid="{table_id}".*?</table>)', re.S)
+    for table_id in ("home_starters", "vis_starters")
+}
+
+
+def _is_cached(url: str) -> bool:
+    """Check whether a fresh copy of a page is already in the on-disk HTTP cache."""
+    if requests_cache is None:
+        return False
+    request = _SESSION.prepare_request(requests.Request("GET", url, headers=BROWSER_HEADERS))
+    cached = _SESSION.cache.get_response(_SESSION.cache.create_key(request))
+    return cached is not None and not cached.is_expired
+
+
+def _fetch_html(url: str) -> str:
+    """Fetch a Pro Football Reference page over the shared keep-alive session."""
+    if not _is_cached(url):
+        _PFR_LIMITER.acquire()
+    response = _SESSION.get(url, headers=BROWSER_HEADERS, timeout=15)
+    response.raise_for_status()
+    return response.text
+
+
+def _scrape_nfl_player_meta(url: str) -> tuple:
+    """Fetch a player page and return (college, headshot_url) from its #meta block."""
+    import lxml.html
+    
+    # lxml builds the tree in C; only the #meta subtree is queried
+    tree = lxml.html.fromstring(_fetch_html(url))
+    meta = tree.get_element_by_id("meta", None)
+    college = "Unknown"
+    headshot_url = None
+    
+    if meta is not None:
+        # Get college
+        label = next((s for s in meta.iter("strong") if s.text_content().strip().startswith("College")), None)
+        if label is not None:
+            for node in label.itersiblings():
+                if node.tag == "br":
+                    break
+                if node.tag == "a":
+                    href = node.get("href", "")
+                    if href.startswith("/schools/") and "high_schools" not in href:
+                        college = node.text_content().strip()
+        
+        # Get headshot image
+        srcs = meta.xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' media-item ')]//img/@src")
+        if srcs:
+            headshot_url = srcs[0]
+    
+    return college, headshot_url
+
+
+def _load_nfl_player_meta_cache() -> dict:
+    """Load previously scraped (college, headshot_url) pairs keyed by PFR player URL."""
+    if not NFL_PLAYER_META_DB_PATH.exists():
+        return {}
+    try:
+        conn = sqlite3.connect(NFL_PLAYER_META_DB_PATH)
+        try:
+            rows = conn.execute("SELECT url, college, headshot_url FROM nfl_player_meta").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not read NFL player cache: {e}")
+        return {}
+    return {url: (college, headshot_url) for url, college, headshot_url in rows}
+
+
+# A retired player's college and headshot never change, so each profile page
+# only has to be scraped once across runs
+_NFL_PLAYER_META_CACHE = _load_nfl_player_meta_cache()
+
+
+def get_nfl_player_meta(url: str) -> tuple:
+    """Return (college, headshot_url) for a player page, scraping only on a cache miss."""
+    cached = _NFL_PLAYER_META_CACHE.get(url)
+    if cached is not None:
+        return cached
+    
+    meta = _scrape_nfl_player_meta(url)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with _PLAYER_CACHE_LOCK:
+            _NFL_PLAYER_META_CACHE[url] = meta
+            conn = sqlite3.connect(NFL_PLAYER_META_DB_PATH)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS nfl_player_meta ("
+                    "url TEXT PRIMARY KEY, college TEXT, headshot_url TEXT, fetched_at REAL)"
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO nfl_player_meta VALUES (?, ?, ?, ?)",
+                    (url, *meta, time.time()),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not persist NFL player cache: {e}")
+    return meta
+
+
+_NFL_COLLEGE_SPECIAL_CASES = {
+    "miami (fl)": "miami",
+    "miami (florida)": "miami",
+    "miami (ohio)": "miami of ohio",
+    "miami (oh)": "miami of ohio",
+    "university of miami": "miami",
+    "mississippi": "ole miss",
+    "university of mississippi": "ole miss",
+    "north carolina st.": "nc state",
+    "north carolina state": "nc state",
+    "sam houston state": "sam houston"
+}
+
+_POS_SYNONYMS = {
+    "HB": "RB", "TB": "RB", "HALFBACK": "RB", "TAILBACK": "RB",
+    "WIDE RECEIVER": "WR", "TIGHT END": "TE", "FULLBACK": "FB", "QUARTERBACK": "QB",
+}
+
+_TRAIL_DIGITS_RE = re.compile(r'\d+$')
+
+
+@functools.lru_cache(maxsize=1)
 def load_nfl_college_data() -> dict:
-    """Load college data for NFL matching."""
+    """Load college data for NFL matching (read once per process; treat as read-only)."""
     colleges = {}
     try:
-        import csv
         with open(NFL_COLLEGE_DATA_FILE, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -865,44 +1352,20 @@ def load_nfl_college_data() -> dict:
         return {}
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_nfl_college_name(name: str) -> str:
-    """Normalize college names for matching."""
+    """Normalize college names for matching (memoized; the same schools recur constantly)."""
     if not name or name.lower().strip() in {"unknown", "none", ""}:
         return ""
     
     normalized = name.lower().strip()
     
-    special_cases = {
-        "miami (fl)": "miami",
-        "miami (florida)": "miami",
-        "miami (ohio)": "miami of ohio",
-        "miami (oh)": "miami of ohio",
-        "university of miami": "miami",
-        "mississippi": "ole miss",
-        "university of mississippi": "ole miss",
-        "north carolina st.": "nc state",
-        "north carolina state": "nc state",
-        "sam houston state": "sam houston"
-    }
-    
-    if normalized in special_cases:
-        return special_cases[normalized]
+    if normalized in _NFL_COLLEGE_SPECIAL_CASES:
+        return _NFL_COLLEGE_SPECIAL_CASES[normalized]
     
-    normalized = (normalized
-                 .replace("university of ", "")
-                 .replace("univ. of ", "")
-                 .replace("state university", "state")
-                 .replace("university", "")
-                 .replace(" at ", " ")
-                 .replace("the ", "")
-                 .replace("st.", "state")
-                 .replace("st ", "state ")
-                 .replace("-", " ")
-                 .replace(".", "")
-                 .replace("(", "")
-                 .replace(")", ""))
-    
-    return re.sub(r'\s+', ' ', normalized).strip()
+    # Same ordered substitutions as the NBA clean_name; its extra "state." step
+    # only drops a dot the final cleanup removes anyway (see test_college_names.py)
+    return clean_name(normalized)
 
 
 def normalize_pos(position: str) -> str:
@@ -910,21 +1373,13 @@ def normalize_pos(position: str) -> str:
     if not position:
         return ""
     
-    pos = position.upper().strip()
-    pos = re.sub(r'\d+$', '', pos)
-    
-    synonyms = {
-        "HB": "RB", "TB": "RB", "HALFBACK": "RB", "TAILBACK": "RB",
-        "WIDE RECEIVER": "WR", "TIGHT END": "TE", "FULLBACK": "FB", "QUARTERBACK": "QB",
-    }
-    return synonyms.get(pos, pos)
+    pos = _TRAIL_DIGITS_RE.sub('', position.upper().strip())
+    return _POS_SYNONYMS.get(pos, pos)
 
 
 def generate_nfl_quiz(count: int = 1) -> int:
     """Generate NFL quizzes automatically."""
-    from urllib.request import Request, urlopen
-    from bs4 import BeautifulSoup, Comment
-    from io import StringIO
+    import lxml.html
     
     print(f"🏈 Generating {count} NFL quiz(es)...")
     
@@ -947,25 +1402,20 @@ def generate_nfl_quiz(count: int = 1) -> int:
         try:
             # Get team games
             url = f"{BASE_URL}/teams/{team}/{season}.htm"
-            req = Request(url, headers=BROWSER_HEADERS)
-            time.sleep(random.uniform(1, 2))  # Be respectful
-            html = urlopen(req, timeout=15).read().decode("utf-8")
-            soup = BeautifulSoup(html, "lxml")
+            html = _fetch_html(url)
+            tree = lxml.html.fromstring(html)
             
-            boxscore_links = soup.select("table#games a[href*='/boxscores/']")
+            boxscore_links = tree.xpath("//table[@id='games']//a[contains(@href, '/boxscores/')]/@href")
             if not boxscore_links:
                 continue
             
-            boxscore_urls = [BASE_URL + link["href"] for link in boxscore_links]
-            random.shuffle(boxscore_urls)
+            # Try up to 5 random games
+            picked_links = random.sample(boxscore_links, k=min(5, len(boxscore_links)))
+            boxscore_urls = [BASE_URL + href for href in picked_links]
             
-            for boxscore_url in boxscore_urls[:5]:  # Try up to 5 games
-                time.sleep(random.uniform(2, 4))
-                
+            for boxscore_url in boxscore_urls:
                 try:
-                    req = Request(boxscore_url, headers=BROWSER_HEADERS)
-                    html = urlopen(req, timeout=15).read().decode("utf-8")
-                    soup = BeautifulSoup(html, "lxml")
+                    html = _fetch_html(boxscore_url)
                     
                     # Determine home/visitor
                     filename = boxscore_url.split('/')[-1]
@@ -973,34 +1423,24 @@ def generate_nfl_quiz(count: int = 1) -> int:
                     is_home = team_from_url.lower() == team.lower()
                     
                     # Find starters table
-                    comments = soup.find_all(string=lambda t: isinstance(t, Comment))
                     table_id = "home_starters" if is_home else "vis_starters"
-                    starters_html = None
-                    
-                    for comment in comments:
-                        if table_id in comment:
-                            starters_html = comment
-                            break
-                    
-                    if not starters_html:
+                    match = _STARTERS_RE[table_id].search(html)
+                    if not match:
                         continue
+                    starters_table = lxml.html.fromstring(match.group(1))
                     
-                    starters_df = pd.read_html(StringIO(starters_html), header=0, attrs={"id": table_id})[0]
-                    soup_table = BeautifulSoup(starters_html, "lxml")
-                    player_links = soup_table.select(f"table#{table_id} th[data-stat='player'] a")
-                    
-                    # Get skill position players
+                    # Get skill position players: names, profile links and
+                    # positions all come from the same data-stat cells of each row
                     players = []
-                    for i, link in enumerate(player_links):
-                        if i >= len(starters_df):
-                            break
-                        
-                        player_name = link.get_text(strip=True)
-                        player_href = link["href"]
-                        player_url = BASE_URL + player_href
+                    for row in starters_table.iterfind(".//tr"):
+                        player_link = row.find("th[@data-stat='player']/a")
+                        if player_link is None or not player_link.get("href"):
+                            continue
                         
-                        row = starters_df.iloc[i]
-                        position = normalize_pos(str(row.get("Pos", "")))
+                        player_name = player_link.text_content().strip()
+                        player_url = BASE_URL + player_link.get("href")
+                        pos_cell = row.find("td[@data-stat='pos']")
+                        position = normalize_pos(pos_cell.text_content() if pos_cell is not None else "")
                         
                         if position in SKILL_POSITIONS:
                             players.append({
@@ -1014,37 +1454,17 @@ def generate_nfl_quiz(count: int = 1) -> int:
                     
                     # Get college info for all players
                     quiz_players = []
+                    pending_avatars = []  # (name, headshot_url) for the batch avatar pick
                     all_valid = True
-                    used_avatars = set()  # Track used avatars to avoid duplicates
+                    
+                    # Fetch and parse every player page up front on the worker
+                    # pool; the rate limiter keeps the pace polite while
+                    # validation work overlaps I/O and parsing
+                    page_futures = [_HTTP_POOL.submit(get_nfl_player_meta, p["url"]) for p in players[:6]]
                     
                     for i, player in enumerate(players[:6]):
-                        time.sleep(random.uniform(2, 4))
-                        
                         try:
-                            req = Request(player["url"], headers=BROWSER_HEADERS)
-                            html = urlopen(req, timeout=15).read().decode("utf-8")
-                            soup = BeautifulSoup(html, "lxml")
-                            
-                            meta = soup.find(id="meta")
-                            college = "Unknown"
-                            headshot_url = None
-                            
-                            if meta:
-                                # Get college
-                                label = meta.find("strong", string=lambda s: s and s.strip().startswith("College"))
-                                if label:
-                                    for node in label.next_siblings:
-                                        if getattr(node, "name", None) == "br":
-                                            break
-                                        if getattr(node, "name", None) == "a":
-                                            href = node.get("href", "")
-                                            if href.startswith("/schools/") and "high_schools" not in href:
-                                                college = node.get_text(strip=True)
-                                
-                                # Get headshot image
-                                media_item = meta.select_one(".media-item img")
-                                if media_item and media_item.get("src"):
-                                    headshot_url = media_item["src"]
+                            college, headshot_url = page_futures[i].result()
                             
                             if college == "Unknown":
                                 all_valid = False
@@ -1058,36 +1478,38 @@ def generate_nfl_quiz(count: int = 1) -> int:
                                 all_valid = False
                                 break
                             
-                            # AI avatar selection with vision
-                            team_normalized = normalize_team_abbrev(team.upper())
-                            avatar = get_ai_avatar_selection(
-                                player["name"], team_normalized, is_nba=False,
-                                headshot_url=headshot_url, used_avatars=used_avatars
-                            )
-                            used_avatars.add(avatar)  # Mark as used
-                            
                             quiz_players.append({
                                 "name": player["name"],
                                 "position": f"{player['position']}{i+1}",
                                 "college": matched_college,
                                 "player_url": player["url"],
-                                "team_abbrev": team_normalized,
-                                "avatar": avatar
+                                "team_abbrev": normalize_team_abbrev(team.upper()),
                             })
+                            pending_avatars.append({"name": player["name"], "headshot_url": headshot_url})
                             
-                            print(f"✅ {player['name']}: {matched_college} (Avatar {avatar})")
+                            print(f"✅ {player['name']}: {matched_college}")
                             
                         except Exception as e:
                             print(f"⚠️ Error getting college for {player['name']}: {e}")
                             all_valid = False
                             break
                     
+                    # Drop prefetches for players we no longer need
+                    for future in page_futures:
+                        future.cancel()
+                    
                     if not all_valid or len(quiz_players) < 4:
                         continue
                     
+                    # AI avatar selection with vision: one request for the whole lineup
+                    team_normalized = normalize_team_abbrev(team.upper())
+                    avatars = get_ai_avatar_selections_batch(pending_avatars, team_normalized, is_nba=False)
+                    for quiz_player in quiz_players:
+                        quiz_player["avatar"] = avatars[quiz_player["name"]]
+                        print(f"🎨 {quiz_player['name']} → Avatar {quiz_player['avatar']}")
+                    
                     # Save quiz
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    team_normalized = normalize_team_abbrev(team.upper())
                     quiz_data = {
                         "team": team_normalized,
                         "season": season,
@@ -1100,8 +1522,7 @@ def generate_nfl_quiz(count: int = 1) -> int:
                     fname = f"players_{timestamp}.json"
                     out_path = NFL_SAVE_DIR / fname
                     
-                    with out_path.open("w", encoding="utf-8") as f:
-                        json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+                    _write_quiz_json(out_path, quiz_data)
                     
                     print(f"✅ Saved NFL quiz: {fname}")
                     generated += 1
@@ -1132,9 +1553,16 @@ def main():
                        help="Type of quiz to generate")
     parser.add_argument("--count", type=int, default=1,
                        help="Number of quizzes to generate per game type")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Ignore cached avatar picks and Pro Football Reference pages")
     
     args = parser.parse_args()
     
+    if args.no_cache:
+        _AVATAR_CACHE.clear()
+        if requests_cache is not None:
+            _SESSION.cache.clear()
+    
     print(f"🚀 Automated Quiz Generator")
     print(f"   Game type: {args.game}")
     print(f"   Count: {args.count}")
@@ -1,29 +1,70 @@
 """
 Simple JSON-based ballot storage system
 Alternative to SQL database for CFB Creator Poll
+
+Each poll directory holds an append-only ballots.jsonl plus an index.json
+mapping user keys to the offset/length of their latest ballot line. Once
+superseded lines make up most of the file, it is compacted down to each
+user's latest ballot.
 """
 
+import copy
 import json
 import os
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 import uuid
 
+try:
+    import orjson  # Optional: faster ballot encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl  # Optional: cross-process poll locks (not available on Windows)
+except ImportError:
+    fcntl = None
+
+
+def _loads(data: bytes):
+    """Decode JSON from bytes, using orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+    """Encode compact JSON to UTF-8 bytes, using orjson when available"""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
 class BallotStorage:
+    BALLOTS_FILE = "ballots.jsonl"
+    INDEX_FILE = "index.json"
+    LOCK_FILE = ".lock"
+    # Written to storage_dir once legacy per-user files have been converted
+    MIGRATION_MARKER = ".legacy_migrated"
+    # Compact ballots.jsonl once it is this big and at least half superseded lines
+    COMPACT_MIN_BYTES = 64 * 1024
+
     def __init__(self, storage_dir: str = "ballot_data"):
         self.storage_dir = storage_dir
+        self._poll_cache = {}  # (season, week) -> (index mtime, poll snapshot)
+        self._poll_locks = {}  # poll_dir -> threading.Lock
+        self._poll_locks_guard = threading.Lock()
         self.ensure_storage_dir()
+        self.migrate_legacy_ballots()
     
     def ensure_storage_dir(self):
         """Create storage directory if it doesn't exist"""
-        if not os.path.exists(self.storage_dir):
-            os.makedirs(self.storage_dir)
+        os.makedirs(self.storage_dir, exist_ok=True)
     
     def get_poll_dir(self, season: int, week: int) -> str:
         """Get directory path for a specific poll"""
         poll_dir = os.path.join(self.storage_dir, f"season_{season}", f"week_{week}")
-        if not os.path.exists(poll_dir):
-            os.makedirs(poll_dir)
+        os.makedirs(poll_dir, exist_ok=True)
         return poll_dir
     
     def get_user_filename(self, user_id: str, user_type: str = "registered") -> str:
@@ -35,30 +76,171 @@ class BallotStorage:
         else:
             return f"user_{user_id}.json"
     
+    def get_user_key(self, user_id: str, user_type: str = "registered") -> str:
+        """Key identifying a user's ballot in the poll index"""
+        return os.path.splitext(self.get_user_filename(user_id, user_type))[0]
+    
+    @contextmanager
+    def poll_lock(self, poll_dir: str):
+        """Serialize ballot appends and index updates for one poll across threads and processes"""
+        with self._poll_locks_guard:
+            lock = self._poll_locks.setdefault(poll_dir, threading.Lock())
+        
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(poll_dir, self.LOCK_FILE), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def load_index(self, poll_dir: str) -> Dict:
+        """Load the poll index mapping user keys to ballot locations"""
+        index_path = os.path.join(poll_dir, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                return _loads(f.read())
+        return {}
+    
+    def replace_file(self, poll_dir: str, filename: str, data: bytes):
+        """Write a poll file through a unique temp file and swap it in atomically"""
+        fd, tmp_path = tempfile.mkstemp(dir=poll_dir, prefix=filename + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(poll_dir, filename))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def save_index(self, poll_dir: str, index: Dict):
+        """Replace the poll index in one write"""
+        self.replace_file(poll_dir, self.INDEX_FILE, _dumps(index))
+    
+    def compact_ballots(self, poll_dir: str, index: Dict) -> Dict:
+        """Rewrite ballots.jsonl with only each user's latest ballot and save the re-offset index.
+        
+        Call with poll_lock(poll_dir) held.
+        """
+        with open(os.path.join(poll_dir, self.BALLOTS_FILE), 'rb') as f:
+            data = f.read()
+        
+        lines = []
+        compacted = {}
+        offset = 0
+        for user_key, entry in index.items():
+            line = data[entry["offset"]:entry["offset"] + entry["length"]]
+            lines.append(line)
+            compacted[user_key] = dict(entry, offset=offset)
+            offset += len(line)
+        
+        self.replace_file(poll_dir, self.BALLOTS_FILE, b"".join(lines))
+        self.save_index(poll_dir, compacted)
+        return compacted
+    
+    def append_ballot_records(self, poll_dir: str, index: Dict, records: List[tuple]):
+        """Append (user_key, ballot_record) pairs to the poll's JSONL file in one write and index them.
+        
+        Call with poll_lock(poll_dir) held so the offsets match what was written.
+        """
+        lines = [_dumps(ballot_record) + b"\n" for _, ballot_record in records]
+        data = b"".join(lines)
+        with open(os.path.join(poll_dir, self.BALLOTS_FILE), 'ab') as f:
+            f.write(data)
+            f.flush()
+            offset = f.tell() - len(data)
+        
+        for (user_key, ballot_record), line in zip(records, lines):
+            index[user_key] = {
+                "offset": offset,
+                "length": len(line),
+                "ballot_id": ballot_record["ballot_id"],
+                "submitted_at": ballot_record["submitted_at"]
+            }
+            offset += len(line)
+    
+    def migrate_legacy_ballots(self):
+        """One-shot conversion of per-user ballot files into ballots.jsonl + index.json"""
+        marker_path = os.path.join(self.storage_dir, self.MIGRATION_MARKER)
+        if os.path.exists(marker_path):
+            return
+        
+        try:
+            with os.scandir(self.storage_dir) as seasons:
+                season_dirs = [e.path for e in seasons
+                               if e.name.startswith("season_") and e.is_dir(follow_symlinks=False)]
+            
+            for season_path in season_dirs:
+                with os.scandir(season_path) as weeks:
+                    poll_dirs = [e.path for e in weeks
+                                 if e.name.startswith("week_") and e.is_dir(follow_symlinks=False)]
+                
+                for poll_dir in poll_dirs:
+                    with self.poll_lock(poll_dir):
+                        index = self.load_index(poll_dir)
+                        with os.scandir(poll_dir) as it:
+                            legacy_files = sorted(
+                                (e.name[:-len('.json')], e.path) for e in it
+                                if e.name.endswith('.json') and e.name != self.INDEX_FILE
+                                and e.is_file(follow_symlinks=False)
+                            )
+                        
+                        records = []
+                        for user_key, filepath in legacy_files:
+                            if user_key in index:
+                                continue
+                            with open(filepath, 'rb') as f:
+                                records.append((user_key, _loads(f.read())))
+                        
+                        if records:
+                            self.append_ballot_records(poll_dir, index, records)
+                            self.save_index(poll_dir, index)
+                            print(f"📦 Migrated {len(records)} legacy ballot(s) in {poll_dir}")
+            
+            # Nothing writes per-user files any more, so later runs can skip the scan
+            with open(marker_path, 'w') as f:
+                f.write(datetime.now().isoformat())
+        
+        except Exception as e:
+            print(f"❌ Error migrating legacy ballots: {e}")
+    
     def save_ballot(self, season: int, week: int, user_id: str, ballot_data: List[Dict], 
                    user_type: str = "registered") -> bool:
         """Save a user's complete ballot"""
         try:
             poll_dir = self.get_poll_dir(season, week)
-            filename = self.get_user_filename(user_id, user_type)
-            filepath = os.path.join(poll_dir, filename)
-            
-            # Check if ballot already exists
-            existing_ballot = self.load_ballot(season, week, user_id, user_type)
-            
-            ballot_record = {
-                "user_id": user_id,
-                "user_type": user_type,
-                "poll_season": season,
-                "poll_week": week,
-                "ballot": ballot_data,
-                "submitted_at": existing_ballot.get("submitted_at", datetime.now().isoformat()) if existing_ballot else datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "ballot_id": existing_ballot.get("ballot_id", str(uuid.uuid4())) if existing_ballot else str(uuid.uuid4())
-            }
+            user_key = self.get_user_key(user_id, user_type)
             
-            with open(filepath, 'w') as f:
-                json.dump(ballot_record, f, indent=2)
+            with self.poll_lock(poll_dir):
+                # Preserve submission time and id from the index instead of re-reading the ballot
+                index = self.load_index(poll_dir)
+                existing_entry = index.get(user_key)
+                now = datetime.now().isoformat()
+                
+                ballot_record = {
+                    "user_id": user_id,
+                    "user_type": user_type,
+                    "poll_season": season,
+                    "poll_week": week,
+                    "ballot": ballot_data,
+                    "submitted_at": existing_entry["submitted_at"] if existing_entry else now,
+                    "updated_at": now,
+                    "ballot_id": existing_entry["ballot_id"] if existing_entry else str(uuid.uuid4())
+                }
+                
+                self.append_ballot_records(poll_dir, index, [(user_key, ballot_record)])
+                
+                # The new line is the last one, so it marks the file's size
+                file_size = index[user_key]["offset"] + index[user_key]["length"]
+                live_bytes = sum(entry["length"] for entry in index.values())
+                if file_size >= self.COMPACT_MIN_BYTES and live_bytes * 2 <= file_size:
+                    self.compact_ballots(poll_dir, index)
+                else:
+                    self.save_index(poll_dir, index)
+            self._poll_cache.pop((season, week), None)
             
             print(f"✅ Saved ballot for {user_type} {user_id} - Week {week}, Season {season}")
             return True
@@ -72,67 +254,78 @@ class BallotStorage:
         """Load a user's ballot"""
         try:
             poll_dir = self.get_poll_dir(season, week)
-            filename = self.get_user_filename(user_id, user_type)
-            filepath = os.path.join(poll_dir, filename)
-            
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    return json.load(f)
+            # Locked so compaction can't swap the file between index and ballot reads
+            with self.poll_lock(poll_dir):
+                entry = self.load_index(poll_dir).get(self.get_user_key(user_id, user_type))
+                
+                if entry:
+                    with open(os.path.join(poll_dir, self.BALLOTS_FILE), 'rb') as f:
+                        f.seek(entry["offset"])
+                        return _loads(f.read(entry["length"]))
             return None
             
         except Exception as e:
             print(f"❌ Error loading ballot: {e}")
             return None
     
-    def get_all_ballots(self, season: int, week: int) -> List[Dict]:
-        """Get all ballots for a specific poll"""
-        try:
-            poll_dir = self.get_poll_dir(season, week)
-            ballots = []
-            
-            if os.path.exists(poll_dir):
-                for filename in os.listdir(poll_dir):
-                    if filename.endswith('.json'):
-                        filepath = os.path.join(poll_dir, filename)
-                        with open(filepath, 'r') as f:
-                            ballot = json.load(f)
-                            ballots.append(ballot)
-            
-            return ballots
+    def read_poll_ballots(self, poll_dir: str) -> List[Dict]:
+        """Read every user's latest ballot from a poll directory"""
+        # Locked so compaction can't swap the file between index and ballot reads
+        with self.poll_lock(poll_dir):
+            index = self.load_index(poll_dir)
+            if not index:
+                return []
             
+            # One read of the JSONL file; the index picks each user's latest line
+            with open(os.path.join(poll_dir, self.BALLOTS_FILE), 'rb') as f:
+                data = f.read()
+        
+        return [
+            _loads(data[entry["offset"]:entry["offset"] + entry["length"]])
+            for entry in index.values()
+        ]
+    
+    def load_poll(self, season: int, week: int) -> Dict:
+        """Load ballots, stats and results for a poll in one scan, memoized until the index changes"""
+        poll_dir = self.get_poll_dir(season, week)
+        try:
+            index_mtime = os.stat(os.path.join(poll_dir, self.INDEX_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            index_mtime = None
+        
+        cached = self._poll_cache.get((season, week))
+        if cached and cached[0] == index_mtime:
+            return cached[1]
+        
+        try:
+            ballots = self.read_poll_ballots(poll_dir)
         except Exception as e:
             print(f"❌ Error loading ballots: {e}")
-            return []
-    
-    def calculate_poll_results(self, season: int, week: int) -> List[Dict]:
-        """Calculate aggregated poll results"""
-        ballots = self.get_all_ballots(season, week)
+            ballots = []
+            index_mtime = -1  # Don't serve a failed read from the cache
         
-        # Aggregate votes by team
-        team_votes = {}
+        # Aggregate stats and votes by team in a single pass
+        rank_sum = defaultdict(int)
+        rank_count = defaultdict(int)
+        user_types = defaultdict(int)
         
         for ballot in ballots:
+            user_types[ballot['user_type']] += 1
             for vote in ballot['ballot']:
                 team_name = vote['team_name']
                 rank = vote['rank']
-                
-                if team_name not in team_votes:
-                    team_votes[team_name] = []
-                team_votes[team_name].append(rank)
-        
-        # Calculate averages and sort
-        results = []
-        for team_name, ranks in team_votes.items():
-            avg_rank = sum(ranks) / len(ranks)
-            vote_count = len(ranks)
-            points = sum(26 - rank for rank in ranks)  # Points system
-            
-            results.append({
+                rank_sum[team_name] += rank
+                rank_count[team_name] += 1
+        
+        results = [
+            {
                 'team_name': team_name,
                 'vote_count': vote_count,
-                'avg_rank': round(avg_rank, 2),
-                'points': points
-            })
+                'avg_rank': round(rank_sum[team_name] / vote_count, 2),
+                'points': 26 * vote_count - rank_sum[team_name]  # Points system: 26 - rank per vote
+            }
+            for team_name, vote_count in rank_count.items()
+        ]
         
         # Sort by average rank (lower = better)
         results.sort(key=lambda x: x['avg_rank'])
@@ -141,22 +334,31 @@ class BallotStorage:
         for i, result in enumerate(results, 1):
             result['rank'] = i
         
-        return results
+        poll = {
+            'ballots': ballots,
+            'stats': {
+                'total_ballots': len(ballots),
+                'registered_users': user_types['registered'],
+                'guest_users': user_types['guest'],
+                'unique_teams_voted': len(rank_count)
+            },
+            'results': results
+        }
+        self._poll_cache[(season, week)] = (index_mtime, poll)
+        return poll
+    
+    def get_all_ballots(self, season: int, week: int) -> List[Dict]:
+        """Get all ballots for a specific poll"""
+        # Deep copy so callers can't mutate the cached poll snapshot
+        return copy.deepcopy(self.load_poll(season, week)['ballots'])
+    
+    def calculate_poll_results(self, season: int, week: int) -> List[Dict]:
+        """Calculate aggregated poll results"""
+        return [dict(result) for result in self.load_poll(season, week)['results']]
     
     def get_poll_stats(self, season: int, week: int) -> Dict:
         """Get statistics for a poll"""
-        ballots = self.get_all_ballots(season, week)
-        
-        return {
-            'total_ballots': len(ballots),
-            'registered_users': len([b for b in ballots if b['user_type'] == 'registered']),
-            'guest_users': len([b for b in ballots if b['user_type'] == 'guest']),
-            'unique_teams_voted': len(set(
-                vote['team_name'] 
-                for ballot in ballots 
-                for vote in ballot['ballot']
-            ))
-        }
+        return dict(self.load_poll(season, week)['stats'])
 
 # Example usage
 if __name__ == "__main__":
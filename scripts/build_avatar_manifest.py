@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Build per-team avatar manifests for the automated quiz generator.
+
+Each manifest is an avatars.json file next to the team's images/ directory,
+mapping avatar numbers to base64-encoded image data:
+
+    app/starting5/static/<TEAM>/avatars.json         (NBA, from <TEAM>_NN.gif)
+    app/gridiron11/Sprites/<TEAM>/avatars.json       (NFL, from <team>_NN.png)
+
+auto_generate_quiz.py loads a team's manifest with a single read when it
+exists and falls back to the individual image files otherwise. Re-run this
+after adding or replacing sprites.
+
+Usage:
+    python build_avatar_manifest.py
+"""
+
+import base64
+import json
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+NBA_SPRITES_DIR = PROJECT_ROOT / "app" / "starting5" / "static"
+NFL_SPRITES_DIR = PROJECT_ROOT / "app" / "gridiron11" / "Sprites"
+
+
+def build_team_manifest(team_dir: Path, file_pattern: str, count: int) -> int:
+    """Write avatars.json for one team directory; returns the number of avatars."""
+    images_dir = team_dir / "images"
+    avatars = {}
+    for i in range(1, count + 1):
+        avatar_num = f"{i:02d}"
+        avatar_path = images_dir / file_pattern.format(num=avatar_num)
+        if avatar_path.exists():
+            avatars[avatar_num] = base64.standard_b64encode(avatar_path.read_bytes()).decode("utf-8")
+
+    if avatars:
+        (team_dir / "avatars.json").write_text(json.dumps(avatars), encoding="utf-8")
+    return len(avatars)
+
+
+def build_all_manifests():
+    """Build manifests for every NBA and NFL team that has sprite images."""
+    built = 0
+
+    if NBA_SPRITES_DIR.exists():
+        for team_dir in sorted(p for p in NBA_SPRITES_DIR.iterdir() if (p / "images").is_dir()):
+            if build_team_manifest(team_dir, f"{team_dir.name}_{{num}}.gif", 14):
+                built += 1
+
+    if NFL_SPRITES_DIR.exists():
+        for team_dir in sorted(p for p in NFL_SPRITES_DIR.iterdir() if (p / "images").is_dir()):
+            if build_team_manifest(team_dir, f"{team_dir.name.lower()}_{{num}}.png", 10):
+                built += 1
+
+    print(f"✅ Built {built} avatar manifest(s)")
+    return built
+
+
+if __name__ == "__main__":
+    build_all_manifests()
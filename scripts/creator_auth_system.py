@@ -5,21 +5,215 @@ SQLite for user management + CSV for ballot storage
 
 import sqlite3
 import hashlib
+import json
 import secrets
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 import bcrypt
-from functools import wraps
+from functools import lru_cache, wraps
 from flask import Flask, request, session, redirect, url_for, flash, render_template_string
 
+try:
+    import redis  # Optional: shared session store for multi-worker deployments
+except ImportError:
+    redis = None
+
+try:
+    from argon2 import PasswordHasher  # Optional: argon2id password hashing
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:
+    PasswordHasher = None
+
+
+# bcrypt and argon2 release the GIL while hashing, so request threads hash
+# directly; capping concurrent hashes at the CPU count keeps a login burst from
+# oversubscribing the cores (and from holding 64 MB of argon2 memory per thread)
+_PASSWORD_HASH_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+# New hashes use argon2id when available; bcrypt hashes keep verifying and are
+# upgraded on the creator's next successful login
+_ARGON2 = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2) if PasswordHasher else None
+
+
+# Hot-path SQL, kept as module constants so every call hands sqlite3 the exact
+# same text and hits the connection's prepared-statement cache
+_SQL_INSERT_SESSION = '''
+    INSERT INTO creator_sessions (session_id, creator_id, expires_at, ip_address, user_agent)
+    VALUES (?, ?, ?, ?, ?)
+'''
+_SQL_GET_SESSION = '''
+    SELECT cs.creator_id, cs.expires_at, c.username, c.display_name, c.is_admin, c.is_active
+    FROM creator_sessions cs
+    JOIN creators c ON cs.creator_id = c.id
+    WHERE cs.session_id = ? AND cs.expires_at > ? AND c.is_active = 1
+'''
+_SQL_DELETE_SESSION = 'DELETE FROM creator_sessions WHERE session_id = ?'
+_SQL_PURGE_SESSIONS = 'DELETE FROM creator_sessions WHERE expires_at <= ?'
+_SQL_CREATOR_BY_LOGIN = '''
+    SELECT id, username, email, password_hash, display_name, is_active, is_admin
+    FROM creators WHERE username = ? OR email = ?
+'''
+_SQL_TOUCH_LAST_LOGIN = 'UPDATE creators SET last_login = ? WHERE id = ?'
+_SQL_SET_PASSWORD_HASH = 'UPDATE creators SET password_hash = ? WHERE id = ?'
+_SQL_CREATOR_PROFILE = '''
+    SELECT username, email, display_name, bio, twitter_handle, created_at, last_login
+    FROM creators WHERE id = ?
+'''
+_SQL_RECORD_PARTICIPATION = '''
+    INSERT OR REPLACE INTO creator_poll_participation
+    (creator_id, season, week, ballot_submitted_at, ballot_updated_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+class SQLiteSessionStore:
+    """Sessions kept in the creator_sessions table (default; fine for a single process)"""
+    
+    def __init__(self, connect):
+        self._connect = connect
+    
+    def create(self, session_id: str, session_data: dict, expires_at: datetime,
+               ip_address: str = "", user_agent: str = ""):
+        with self._connect() as conn:
+            conn.execute(_SQL_INSERT_SESSION, (session_id, session_data['creator_id'], expires_at, ip_address, user_agent))
+    
+    def get(self, session_id: str):
+        """Return (session_data, expires_at) for a live session of an active creator, else None"""
+        row = self._connect().execute(_SQL_GET_SESSION, (session_id, datetime.now())).fetchone()
+        
+        if not row:
+            return None
+        return {
+            'creator_id': row[0],
+            'username': row[2],
+            'display_name': row[3],
+            'is_admin': row[4]
+        }, datetime.fromisoformat(str(row[1]))
+    
+    def delete(self, session_id: str):
+        with self._connect() as conn:
+            conn.execute(_SQL_DELETE_SESSION, (session_id,))
+    
+    def revoke_creator(self, creator_id: int):
+        # get() already joins on creators.is_active, so nothing to remove here
+        pass
+    
+    def purge_expired(self) -> int:
+        """Delete expired sessions (a range scan on idx_creator_sessions_expires)"""
+        with self._connect() as conn:
+            return conn.execute(_SQL_PURGE_SESSIONS, (datetime.now(),)).rowcount
+
+
+class RedisSessionStore:
+    """Sessions kept in Redis with native expiry, shared by every worker process"""
+    
+    def __init__(self, client, prefix: str = "creator_sess"):
+        self.client = client
+        self.prefix = prefix
+    
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}"
+    
+    def _creator_key(self, creator_id: int) -> str:
+        return f"{self.prefix}:creator:{creator_id}"
+    
+    def create(self, session_id: str, session_data: dict, expires_at: datetime,
+               ip_address: str = "", user_agent: str = ""):
+        ttl = max(1, int((expires_at - datetime.now()).total_seconds()))
+        payload = dict(session_data, expires_at=expires_at.isoformat(),
+                       ip_address=ip_address, user_agent=user_agent)
+        pipe = self.client.pipeline()
+        pipe.set(self._key(session_id), json.dumps(payload), ex=ttl)
+        # Track the creator's sessions so disabling the account can revoke them
+        pipe.sadd(self._creator_key(session_data['creator_id']), session_id)
+        pipe.expire(self._creator_key(session_data['creator_id']), ttl)
+        pipe.execute()
+    
+    def get(self, session_id: str):
+        """Return (session_data, expires_at) for a live session, else None"""
+        raw = self.client.get(self._key(session_id))
+        if not raw:
+            return None
+        payload = json.loads(raw)
+        return {
+            'creator_id': payload['creator_id'],
+            'username': payload['username'],
+            'display_name': payload['display_name'],
+            'is_admin': payload['is_admin']
+        }, datetime.fromisoformat(payload['expires_at'])
+    
+    def delete(self, session_id: str):
+        raw = self.client.get(self._key(session_id))
+        pipe = self.client.pipeline()
+        pipe.delete(self._key(session_id))
+        if raw:
+            pipe.srem(self._creator_key(json.loads(raw)['creator_id']), session_id)
+        pipe.execute()
+    
+    def revoke_creator(self, creator_id: int):
+        session_ids = self.client.smembers(self._creator_key(creator_id))
+        keys = [self._key(sid.decode() if isinstance(sid, bytes) else sid) for sid in session_ids]
+        self.client.delete(self._creator_key(creator_id), *keys)
+    
+    def purge_expired(self) -> int:
+        # Redis expires session keys on its own
+        return 0
+
+
 class CreatorAuthSystem:
-    def __init__(self, db_path="creators.db"):
+    # Bump when init_database changes; databases already at this version skip the DDL
+    SCHEMA_VERSION = 1
+    
+    # Validated sessions are served from memory for up to this many seconds.
+    # The cache is per process: logout or disabling an account only clears it in
+    # the worker that handled the request, so other workers may still accept the
+    # session until their copy expires. With RedisSessionStore (the multi-worker
+    # setup) the cache is turned off and every check goes to Redis.
+    SESSION_CACHE_TTL = 60
+    SESSION_CACHE_MAX = 10000
+    
+    def __init__(self, db_path="creators.db", session_store=None):
         self.db_path = db_path
+        self._local = threading.local()
+        self._session_cache = {}  # session_id -> (monotonic expiry, session dict)
+        self._session_cache_lock = threading.Lock()
         self.init_database()
+        self.session_store = session_store or self._default_session_store()
+        self.session_cache_ttl = 0 if isinstance(self.session_store, RedisSessionStore) else self.SESSION_CACHE_TTL
+        self.session_store.purge_expired()
+    
+    def _default_session_store(self):
+        """Use Redis when CREATOR_SESSION_REDIS_URL is set and redis-py is installed, else SQLite"""
+        redis_url = os.environ.get('CREATOR_SESSION_REDIS_URL')
+        if redis_url and redis is not None:
+            return RedisSessionStore(redis.Redis.from_url(redis_url))
+        if redis_url:
+            print("⚠️ CREATOR_SESSION_REDIS_URL is set but redis is not installed; using SQLite sessions")
+        return SQLiteSessionStore(self._conn)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's long-lived connection, opening and tuning it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # The statement cache is per connection, so the hot-path queries
+            # are only parsed and planned once per thread
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            # WAL lets readers (session checks) proceed while a login writes;
+            # NORMAL sync is durable across app crashes in WAL mode
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            self._local.conn = conn
+        return conn
     
     def init_database(self):
         """Initialize the creators database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+            return
         cursor = conn.cursor()
         
         # Creators table
@@ -67,34 +261,57 @@ class CreatorAuthSystem:
             )
         ''')
         
+        # username/email lookups already use the UNIQUE constraints' automatic
+        # indexes (the login OR query runs as a multi-index OR); expiry needs its own
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_creator_sessions_expires
+            ON creator_sessions (expires_at)
+        ''')
+        
+        cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
         conn.commit()
-        conn.close()
     
     def hash_password(self, password: str) -> str:
-        """Securely hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """Securely hash a password using argon2id (bcrypt if argon2-cffi is missing)"""
+        with _PASSWORD_HASH_SLOTS:
+            if _ARGON2 is not None:
+                return _ARGON2.hash(password)
+            return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
     
     def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify a password against its hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        """Verify a password against its argon2 or bcrypt hash"""
+        if hashed.startswith('$argon2'):
+            if _ARGON2 is None:
+                print("❌ argon2 password hash found but argon2-cffi is not installed")
+                return False
+            try:
+                with _PASSWORD_HASH_SLOTS:
+                    return _ARGON2.verify(hashed, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        with _PASSWORD_HASH_SLOTS:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    
+    def needs_rehash(self, hashed: str) -> bool:
+        """True for legacy bcrypt hashes or argon2 hashes with outdated parameters"""
+        if _ARGON2 is None:
+            return False
+        if not hashed.startswith('$argon2'):
+            return True
+        return _ARGON2.check_needs_rehash(hashed)
     
     def create_creator(self, username: str, email: str, password: str, 
                       display_name: str, bio: str = "", twitter_handle: str = "") -> bool:
         """Create a new creator account"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             password_hash = self.hash_password(password)
             
-            cursor.execute('''
-                INSERT INTO creators (username, email, password_hash, display_name, bio, twitter_handle)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (username, email, password_hash, display_name, bio, twitter_handle))
+            with self._conn() as conn:  # Commits, or rolls back on IntegrityError
+                conn.execute('''
+                    INSERT INTO creators (username, email, password_hash, display_name, bio, twitter_handle)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (username, email, password_hash, display_name, bio, twitter_handle))
             
-            conn.commit()
-            conn.close()
             print(f"✅ Created creator account: {username}")
             return True
             
@@ -104,32 +321,31 @@ class CreatorAuthSystem:
     
     def authenticate_creator(self, username: str, password: str, ip_address: str = "", user_agent: str = "") -> dict:
         """Authenticate a creator and create session"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT id, username, email, password_hash, display_name, is_active, is_admin
-            FROM creators WHERE username = ? OR email = ?
-        ''', (username, username))
+        cursor.execute(_SQL_CREATOR_BY_LOGIN, (username, username))
         
         creator = cursor.fetchone()
         
         if creator and creator[5] and self.verify_password(password, creator[3]):  # is_active and password check
-            # Update last login
-            cursor.execute('UPDATE creators SET last_login = ? WHERE id = ?', 
-                         (datetime.now(), creator[0]))
+            # Upgrade the stored hash while we have the plaintext; hash before taking the write lock
+            new_hash = self.hash_password(password) if self.needs_rehash(creator[3]) else None
+            now = datetime.now()
+            with conn:
+                cursor.execute(_SQL_TOUCH_LAST_LOGIN, (now, creator[0]))
+                if new_hash:
+                    cursor.execute(_SQL_SET_PASSWORD_HASH, (new_hash, creator[0]))
             
             # Create session
             session_id = secrets.token_urlsafe(32)
-            expires_at = datetime.now() + timedelta(days=30)  # 30-day sessions
-            
-            cursor.execute('''
-                INSERT INTO creator_sessions (session_id, creator_id, expires_at, ip_address, user_agent)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (session_id, creator[0], expires_at, ip_address, user_agent))
-            
-            conn.commit()
-            conn.close()
+            expires_at = now + timedelta(days=30)  # 30-day sessions
+            self.session_store.create(session_id, {
+                'creator_id': creator[0],
+                'username': creator[1],
+                'display_name': creator[4],
+                'is_admin': creator[6]
+            }, expires_at, ip_address, user_agent)
             
             return {
                 'success': True,
@@ -141,7 +357,6 @@ class CreatorAuthSystem:
                 'session_id': session_id
             }
         
-        conn.close()
         return {'success': False}
     
     def validate_session(self, session_id: str) -> dict:
@@ -149,50 +364,65 @@ class CreatorAuthSystem:
         if not session_id:
             return {'valid': False}
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if self.session_cache_ttl > 0:
+            with self._session_cache_lock:
+                cached = self._session_cache.get(session_id)
+            if cached and time.monotonic() < cached[0]:
+                return dict(cached[1])
         
-        cursor.execute('''
-            SELECT cs.creator_id, cs.expires_at, c.username, c.display_name, c.is_admin, c.is_active
-            FROM creator_sessions cs
-            JOIN creators c ON cs.creator_id = c.id
-            WHERE cs.session_id = ? AND cs.expires_at > ? AND c.is_active = 1
-        ''', (session_id, datetime.now()))
+        found = self.session_store.get(session_id)
         
-        session_data = cursor.fetchone()
-        conn.close()
-        
-        if session_data:
-            return {
-                'valid': True,
-                'creator_id': session_data[0],
-                'username': session_data[2],
-                'display_name': session_data[3],
-                'is_admin': session_data[4]
-            }
+        if found:
+            session_data, expires_at = found
+            result = dict(session_data, valid=True)
+            if self.session_cache_ttl > 0:
+                # Never cache past the session's own expiry
+                seconds_left = (expires_at - datetime.now()).total_seconds()
+                self._cache_session(session_id, result, min(self.session_cache_ttl, seconds_left))
+            return dict(result)
         
         return {'valid': False}
     
+    def _cache_session(self, session_id: str, result: dict, ttl: float):
+        """Remember a validated session for ttl seconds"""
+        now = time.monotonic()
+        with self._session_cache_lock:
+            if len(self._session_cache) >= self.SESSION_CACHE_MAX:
+                # Drop expired entries; start over if everything is still live
+                self._session_cache = {k: v for k, v in self._session_cache.items() if v[0] > now}
+                if len(self._session_cache) >= self.SESSION_CACHE_MAX:
+                    self._session_cache.clear()
+            self._session_cache[session_id] = (now + ttl, result)
+    
+    def _forget_sessions(self, creator_id: int = None, session_id: str = None):
+        """Drop cached sessions by id or for every session of a creator"""
+        with self._session_cache_lock:
+            if session_id is not None:
+                self._session_cache.pop(session_id, None)
+            if creator_id is not None:
+                self._session_cache = {k: v for k, v in self._session_cache.items()
+                                       if v[1]['creator_id'] != creator_id}
+    
     def logout_creator(self, session_id: str):
         """Logout a creator by removing their session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM creator_sessions WHERE session_id = ?', (session_id,))
-        conn.commit()
-        conn.close()
+        self.session_store.delete(session_id)
+        self._forget_sessions(session_id=session_id)
+    
+    def set_creator_active(self, creator_id: int, is_active: bool):
+        """Enable or disable a creator account; a disabled creator's sessions stop validating at once"""
+        with self._conn() as conn:
+            conn.execute('UPDATE creators SET is_active = ? WHERE id = ?', (1 if is_active else 0, creator_id))
+        if not is_active:
+            self.session_store.revoke_creator(creator_id)
+        self._forget_sessions(creator_id=creator_id)
     
     def get_creator_profile(self, creator_id: int) -> dict:
         """Get creator profile information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
-        cursor.execute('''
-            SELECT username, email, display_name, bio, twitter_handle, created_at, last_login
-            FROM creators WHERE id = ?
-        ''', (creator_id,))
+        cursor.execute(_SQL_CREATOR_PROFILE, (creator_id,))
         
         profile = cursor.fetchone()
-        conn.close()
         
         if profile:
             return {
@@ -209,29 +439,33 @@ class CreatorAuthSystem:
     
     def record_ballot_submission(self, creator_id: int, season: int, week: int):
         """Record that a creator submitted a ballot"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO creator_poll_participation 
-            (creator_id, season, week, ballot_submitted_at, ballot_updated_at)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (creator_id, season, week, datetime.now(), datetime.now()))
-        
-        conn.commit()
-        conn.close()
+        now = datetime.now()  # Submitted and updated share one timestamp
+        with self._conn() as conn:
+            conn.execute(_SQL_RECORD_PARTICIPATION, (creator_id, season, week, now, now))
+
+def load_secret_key():
+    """Flask secret key from SECRET_KEY; falls back to a random per-process key"""
+    secret_key = os.environ.get('SECRET_KEY')
+    if secret_key:
+        return secret_key
+    print("⚠️ SECRET_KEY not set; using a random key (sessions reset on restart and aren't shared across workers)")
+    return secrets.token_bytes(32)
 
 # Flask integration
 app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-this'
-auth_system = CreatorAuthSystem()
+app.secret_key = load_secret_key()
+
+@lru_cache(maxsize=None)
+def get_auth_system(db_path="creators.db") -> CreatorAuthSystem:
+    """One CreatorAuthSystem per database, built on first use inside the worker process"""
+    return CreatorAuthSystem(db_path)
 
 def login_required(f):
     """Decorator to require creator login"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
         session_id = session.get('creator_session_id')
-        session_data = auth_system.validate_session(session_id)
+        session_data = get_auth_system().validate_session(session_id)
         
         if not session_data['valid']:
             flash('Please log in to access this page.', 'error')
@@ -248,7 +482,7 @@ def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         session_id = session.get('creator_session_id')
-        session_data = auth_system.validate_session(session_id)
+        session_data = get_auth_system().validate_session(session_id)
         
         if not session_data['valid'] or not session_data['is_admin']:
             flash('Admin access required.', 'error')
@@ -266,7 +500,7 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
         
-        auth_result = auth_system.authenticate_creator(
+        auth_result = get_auth_system().authenticate_creator(
             username, password, 
             request.remote_addr, 
             request.headers.get('User-Agent', '')
@@ -295,7 +529,7 @@ def login():
 @login_required
 def creator_dashboard():
     """Creator dashboard"""
-    profile = auth_system.get_creator_profile(request.creator['creator_id'])
+    profile = get_auth_system().get_creator_profile(request.creator['creator_id'])
     
     return render_template_string('''
     <h1>Welcome, {{ creator.display_name }}!</h1>
@@ -311,7 +545,7 @@ def logout():
     """Creator logout"""
     session_id = session.get('creator_session_id')
     if session_id:
-        auth_system.logout_creator(session_id)
+        get_auth_system().logout_creator(session_id)
     
     session.clear()
     flash('You have been logged out.', 'info')
@@ -320,7 +554,7 @@ def logout():
 # Example usage
 if __name__ == '__main__':
     # Create some sample creators
-    auth_system.create_creator(
+    get_auth_system().create_creator(
         username="coach_smith",
         email="coach@example.com", 
         password="secure_password_123",
@@ -329,7 +563,7 @@ if __name__ == '__main__':
         twitter_handle="@coachsmith"
     )
     
-    auth_system.create_creator(
+    get_auth_system().create_creator(
         username="sports_writer",
         email="writer@sports.com",
         password="another_secure_pass",
@@ -5,13 +5,21 @@ Super simple alternative to SQL database
 
 import csv
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from collections import defaultdict
-import pandas as pd  # Optional for easier analysis
+import pandas as pd  # Required: polls are read and aggregated as DataFrames
+
+
+def _export_week(storage_dir: str, season: int, week: int) -> bool:
+    """Process-pool worker: rebuild the storage in this process and export one week"""
+    return CSVBallotStorage(storage_dir).export_to_excel(season, week)
+
 
 class CSVBallotStorage:
     def __init__(self, storage_dir: str = "csv_ballots"):
         self.storage_dir = storage_dir
+        # (season, week) -> (file stamp, has all columns, poll snapshot)
+        self._poll_cache = {}
         self.ensure_storage_dir()
     
     def ensure_storage_dir(self):
@@ -26,10 +34,8 @@ class CSVBallotStorage:
         """Save ballot to CSV file"""
         csv_file = self.get_ballot_file(season, week)
         
-        # Remove existing ballot for this user
-        self.remove_user_ballot(season, week, user_id, user_type)
-        
-        # Append new ballot
+        # Append new ballot; readers keep only each user's latest submission,
+        # so an update never rewrites the rest of the file
         with open(csv_file, 'a', newline='') as f:
             writer = csv.writer(f)
             
@@ -37,45 +43,48 @@ class CSVBallotStorage:
             if f.tell() == 0:
                 writer.writerow(['user_id', 'user_type', 'rank', 'team_name', 'team_id', 'reasoning', 'submitted_at'])
             
-            # Write ballot data
+            # Write ballot data in one call
             timestamp = datetime.now().isoformat()
-            for vote in ballot_data:
-                writer.writerow([
-                    user_id,
-                    user_type,
-                    vote['rank'],
-                    vote['team_name'],
-                    vote.get('team_id', ''),
-                    vote.get('reasoning', ''),
-                    timestamp
-                ])
+            writer.writerows([
+                user_id,
+                user_type,
+                vote['rank'],
+                vote['team_name'],
+                vote.get('team_id', ''),
+                vote.get('reasoning', ''),
+                timestamp
+            ] for vote in ballot_data)
         
         print(f"✅ Saved {len(ballot_data)} votes for {user_type} {user_id}")
         return True
     
     def remove_user_ballot(self, season: int, week: int, user_id: str, user_type: str):
-        """Remove existing ballot for user (for updates)"""
+        """Remove every ballot row for a user (rewrites the file; updates don't need this)"""
         csv_file = self.get_ballot_file(season, week)
         
         if not os.path.exists(csv_file):
             return
         
-        # Read existing data
-        rows_to_keep = []
-        with open(csv_file, 'r') as f:
-            reader = csv.reader(f)
+        # Stream the kept rows into a temp file and swap it in atomically, so
+        # readers never see a half-written poll and memory stays flat
+        tmp_file = csv_file + ".tmp"
+        removed = 0
+        with open(csv_file, 'r', newline='') as src, open(tmp_file, 'w', newline='') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
             header = next(reader, None)
             if header:
-                rows_to_keep.append(header)
-                
-                for row in reader:
-                    if len(row) >= 2 and not (row[0] == user_id and row[1] == user_type):
-                        rows_to_keep.append(row)
+                writer.writerow(header)
+            for row in reader:
+                if len(row) >= 2 and row[0] == user_id and row[1] == user_type:
+                    removed += 1
+                else:
+                    writer.writerow(row)
         
-        # Write back without user's old ballot
-        with open(csv_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows_to_keep)
+        if removed:
+            os.replace(tmp_file, csv_file)
+        else:
+            os.remove(tmp_file)
     
     def load_user_ballot(self, season: int, week: int, user_id: str, user_type: str = "registered"):
         """Load a specific user's ballot"""
@@ -85,93 +94,141 @@ class CSVBallotStorage:
             return None
         
         ballot = []
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
+        submitted_at = None
+        with open(csv_file, 'r', newline='') as f:
+            # Plain rows plus header positions: only the user's own rows become dicts
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return None
+            col = {name: i for i, name in enumerate(header)}
+            i_user, i_type, i_rank = col['user_id'], col['user_type'], col['rank']
+            i_team, i_team_id, i_reasoning, i_at = col['team_name'], col['team_id'], col['reasoning'], col['submitted_at']
             for row in reader:
-                if row['user_id'] == user_id and row['user_type'] == user_type:
+                if row[i_user] == user_id and row[i_type] == user_type:
+                    # A new timestamp means a later resubmission; keep only the latest
+                    if row[i_at] != submitted_at:
+                        ballot = []
+                        submitted_at = row[i_at]
                     ballot.append({
-                        'rank': int(row['rank']),
-                        'team_name': row['team_name'],
-                        'team_id': row['team_id'],
-                        'reasoning': row['reasoning']
+                        'rank': int(row[i_rank]),
+                        'team_name': row[i_team],
+                        'team_id': row[i_team_id],
+                        'reasoning': row[i_reasoning]
                     })
         
         return sorted(ballot, key=lambda x: x['rank']) if ballot else None
     
-    def calculate_poll_results(self, season: int, week: int):
-        """Calculate poll results from CSV data"""
-        csv_file = self.get_ballot_file(season, week)
+    # Columns needed to pick each user's current ballot
+    KEY_COLUMNS = ['user_id', 'user_type', 'submitted_at']
+    
+    def get_file_stamp(self, csv_file: str) -> tuple:
+        """Identify a CSV's current contents; appends always change the size"""
+        st = os.stat(csv_file)
+        return st.st_mtime_ns, st.st_size
+    
+    def read_ballot_frame(self, season: int, week: int, columns: list = None) -> pd.DataFrame:
+        """Read the current ballots of a poll, keeping IDs and names as literal strings"""
+        usecols = None if columns is None else list(dict.fromkeys(self.KEY_COLUMNS + columns))
+        df = pd.read_csv(
+            self.get_ballot_file(season, week),
+            usecols=usecols,
+            dtype={'user_id': str, 'user_type': str, 'team_name': str, 'rank': 'int16'},
+            keep_default_na=False
+        )
         
-        if not os.path.exists(csv_file):
-            return []
+        # Updates are appended, so each user's last submission is their current ballot
+        latest = df.groupby(['user_id', 'user_type'], sort=False)['submitted_at'].transform('last')
+        return df[df['submitted_at'] == latest]
+    
+    def load_poll(self, season: int, week: int, all_columns: bool = False) -> dict:
+        """Read a poll's CSV once and derive its current ballots, results and stats together.
         
-        # Count votes by team
-        team_votes = defaultdict(list)
+        The snapshot is reused until the file changes. all_columns also keeps
+        team_id/reasoning in 'ballots' (for export); otherwise only the columns
+        the aggregates need are parsed.
+        """
+        csv_file = self.get_ballot_file(season, week)
         
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                team_name = row['team_name']
-                rank = int(row['rank'])
-                team_votes[team_name].append(rank)
-        
-        # Calculate results
-        results = []
-        for team_name, ranks in team_votes.items():
-            avg_rank = sum(ranks) / len(ranks)
-            vote_count = len(ranks)
-            points = sum(26 - rank for rank in ranks)
-            
-            results.append({
-                'team_name': team_name,
-                'vote_count': vote_count,
-                'avg_rank': round(avg_rank, 2),
-                'points': points
-            })
+        # A missing or empty file has no ballots (pandas can't parse a 0-byte CSV)
+        if not os.path.exists(csv_file) or os.path.getsize(csv_file) == 0:
+            return {
+                'ballots': None,
+                'results': [],
+                'stats': {'total_ballots': 0, 'registered_users': 0, 'guest_users': 0}
+            }
         
-        # Sort by average rank
-        results.sort(key=lambda x: x['avg_rank'])
+        stamp = self.get_file_stamp(csv_file)
+        cached = self._poll_cache.get((season, week))
+        if cached and cached[0] == stamp and (cached[1] or not all_columns):
+            return cached[2]
         
-        # Add rank numbers
-        for i, result in enumerate(results, 1):
-            result['rank'] = i
+        df = self.read_ballot_frame(season, week, columns=None if all_columns else ['team_name', 'rank'])
         
-        return results
-    
-    def get_poll_stats(self, season: int, week: int):
-        """Get poll statistics"""
-        csv_file = self.get_ballot_file(season, week)
+        # Count votes by team (first-appearance order, like the ballots themselves)
+        totals = df.groupby('team_name', sort=False)['rank'].agg(['sum', 'count'])
+        # Python's round (not numpy's) so averages match the old per-team loop exactly
+        totals['avg_rank'] = [round(avg, 2) for avg in (totals['sum'] / totals['count']).tolist()]
+        totals['points'] = 26 * totals['count'] - totals['sum']
         
-        if not os.path.exists(csv_file):
-            return {'total_ballots': 0, 'registered_users': 0, 'guest_users': 0}
+        # Sort by average rank (stable, so ties keep first-appearance order)
+        totals = totals.sort_values('avg_rank', kind='stable')
         
-        users = set()
-        user_types = defaultdict(int)
+        results = [
+            {
+                'team_name': team_name,
+                'vote_count': int(vote_count),
+                'avg_rank': float(avg_rank),
+                'points': int(points),
+                'rank': i
+            }
+            for i, (team_name, vote_count, avg_rank, points) in enumerate(
+                zip(totals.index, totals['count'], totals['avg_rank'], totals['points']), 1)
+        ]
         
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                user_key = (row['user_id'], row['user_type'])
-                users.add(user_key)
-                user_types[row['user_type']] += 1
-        
-        return {
-            'total_ballots': len(users),
-            'registered_users': len([u for u in users if u[1] == 'registered']),
-            'guest_users': len([u for u in users if u[1] == 'guest']),
-            'total_votes': user_types['registered'] + user_types['guest']
+        users_by_type = df[['user_id', 'user_type']].drop_duplicates()['user_type'].value_counts()
+        votes_by_type = df['user_type'].value_counts()
+        stats = {
+            'total_ballots': int(users_by_type.sum()),
+            'registered_users': int(users_by_type.get('registered', 0)),
+            'guest_users': int(users_by_type.get('guest', 0)),
+            'total_votes': int(votes_by_type.get('registered', 0) + votes_by_type.get('guest', 0))
         }
+        
+        poll = {'ballots': df, 'results': results, 'stats': stats}
+        self._poll_cache[(season, week)] = (stamp, all_columns, poll)
+        return poll
+    
+    def calculate_poll_results(self, season: int, week: int):
+        """Calculate poll results from CSV data"""
+        return [dict(result) for result in self.load_poll(season, week)['results']]
+    
+    def get_poll_stats(self, season: int, week: int):
+        """Get poll statistics"""
+        return dict(self.load_poll(season, week)['stats'])
+    
+    def load_polls(self, season: int, weeks: list) -> dict:
+        """Load several weeks' polls concurrently; returns {week: load_poll snapshot}"""
+        weeks = list(weeks)
+        if not weeks:
+            return {}
+        # pandas' C parser releases the GIL, so weeks overlap both disk waits and parsing
+        with ThreadPoolExecutor(max_workers=min(8, len(weeks))) as pool:
+            return dict(zip(weeks, pool.map(lambda week: self.load_poll(season, week), weeks)))
     
     def export_to_excel(self, season: int, week: int, output_file: str = None):
-        """Export poll data to Excel (requires pandas)"""
+        """Export poll data to Excel (requires openpyxl)"""
         csv_file = self.get_ballot_file(season, week)
         
         if not output_file:
             output_file = f"poll_results_{season}_week_{week}.xlsx"
         
         try:
-            # Read CSV
-            df = pd.read_csv(csv_file)
+            # One read of the CSV (current ballots only) feeds every sheet
+            poll = self.load_poll(season, week, all_columns=True)
+            df = poll['ballots']
+            if df is None:
+                raise FileNotFoundError(csv_file)
             
             # Create Excel with multiple sheets
             with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
@@ -179,21 +236,35 @@ class CSVBallotStorage:
                 df.to_excel(writer, sheet_name='All Ballots', index=False)
                 
                 # Poll results
-                results = self.calculate_poll_results(season, week)
-                results_df = pd.DataFrame(results)
+                results_df = pd.DataFrame(poll['results'])
                 results_df.to_excel(writer, sheet_name='Poll Results', index=False)
                 
                 # Stats
-                stats = self.get_poll_stats(season, week)
-                stats_df = pd.DataFrame([stats])
+                stats_df = pd.DataFrame([poll['stats']])
                 stats_df.to_excel(writer, sheet_name='Statistics', index=False)
             
             print(f"✅ Exported to {output_file}")
             return True
             
         except ImportError:
-            print("❌ pandas required for Excel export: pip install pandas openpyxl")
+            print("❌ openpyxl required for Excel export: pip install openpyxl")
             return False
+    
+    def export_season_to_excel(self, season: int, weeks: list = None) -> dict:
+        """Export each week of a season to its own workbook in parallel; returns {week: success}.
+        
+        Writing .xlsx is CPU-bound pure Python, so weeks run in separate processes.
+        Weeks without a ballot file are skipped.
+        """
+        if weeks is None:
+            weeks = range(1, 17)
+        weeks = [week for week in weeks if os.path.exists(self.get_ballot_file(season, week))]
+        if not weeks:
+            return {}
+        
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(weeks))) as pool:
+            futures = {week: pool.submit(_export_week, self.storage_dir, season, week) for week in weeks}
+            return {week: future.result() for week, future in futures.items()}
 
 # Example usage
 if __name__ == "__main__":
@@ -20,14 +20,30 @@ import random
 import time
 import re
 import csv
+import functools
+import gzip
+import hashlib
 import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from urllib.request import Request, urlopen
-from bs4 import BeautifulSoup, Comment
-from io import StringIO
-import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 import argparse
+import atexit
+
+from rate_limit import PFR_LIMITER as _PFR_LIMITER
+
+try:
+    import orjson  # Optional: faster quiz serialization
+except ImportError:
+    orjson = None
 
 # NFL team abbreviations
 NFL_TEAMS = [
@@ -44,12 +60,107 @@ OFFENSIVE_POSITIONS = set(SKILL_POSITIONS)
 
 BASE_URL = "https://www.pro-football-reference.com"
 
+# Scraper caches persist here between runs (shared with auto_generate_quiz's caches)
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+PLAYER_COLLEGE_DB_PATH = CACHE_DIR / "nfl_player_college.sqlite"
+# Gzipped copies of historical pages (past seasons, boxscores), which never change
+PAGE_CACHE_DIR = CACHE_DIR / "pfr"
+
+# One keep-alive session for every pro-football-reference request, so a quiz's
+# dozens of page loads share a few TLS connections instead of a handshake each.
+# The pool is sized for the concurrent quiz, prefetch and player-page threads;
+# dropped connections are retried here, throttling responses in _request()
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=1.5, status_forcelist=()),
+))
+atexit.register(_SESSION.close)
+
+# Boxscores fetched ahead of the one being examined
+BOXSCORE_PREFETCH = 3
+_BOXSCORE_POOL = ThreadPoolExecutor(max_workers=BOXSCORE_PREFETCH)
+
+# Throttling/overload responses are retried after a pause: the server's
+# Retry-After when given, else exponential backoff capped at a minute
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+MAX_BACKOFF = 60
+
+def _retry_delay(response: requests.Response, attempt: int) -> float:
+    """Seconds to back off before retrying a throttled request."""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_BACKOFF)
+    return min(5 * 2 ** attempt, MAX_BACKOFF)
+
+def page_cache_path(url: str) -> Path:
+    """Where fetch_html keeps its cached copy of a URL."""
+    return PAGE_CACHE_DIR / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html.gz")
+
+def _request(url: str) -> requests.Response:
+    """GET through the shared session, paced by the rate limiter and retried when throttled."""
+    for attempt in range(MAX_RETRIES + 1):
+        _PFR_LIMITER.acquire()
+        response = _SESSION.get(url, timeout=30)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        response.close()
+        delay = _retry_delay(response, attempt)
+        print(f"⏳ {response.status_code} from pro-football-reference, backing off {delay:.0f}s")
+        # Pause the shared limiter so every thread backs off, not just this one
+        _PFR_LIMITER.pause(delay)
+    response.raise_for_status()
+    return response
+
+def fetch_html(url: str, cache: bool = False) -> str:
+    """GET a page through the shared session and return it as text.
+    With cache=True the page is served from (and saved to) the on-disk page cache.
+    """
+    path = page_cache_path(url)
+    if cache and path.exists():
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+    
+    response = _request(url)
+    html = response.content.decode("utf-8")
+    
+    if cache:
+        # Write then rename, so a concurrent reader never sees a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(gzip.compress(response.content))
+        os.replace(tmp_path, path)
+    return html
+
+def quiz_json_bytes(quiz_data: dict) -> bytes:
+    """Serialize a quiz as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(quiz_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(quiz_data, indent=2, ensure_ascii=False).encode("utf-8")
+
+# Verbose college-matching output (set NFL_QUIZ_DEBUG=1)
+DEBUG = bool(os.environ.get("NFL_QUIZ_DEBUG"))
+
 # Path to college dataset
 COLLEGE_DATA_FILE = "app/gridiron11/CFB/cbb25.csv"
 
 # Global college data cache
 _college_data = None
 
+# Player pages are fetched in parallel, but at most two at a time; request
+# pacing comes from the shared _PFR_LIMITER
+_COLLEGE_FETCH_SLOTS = threading.BoundedSemaphore(2)
+
+# Random extra delay (seconds) before each player page, so bursts from parallel
+# quiz workers are spread out instead of queueing right at the limiter's rate
+PLAYER_FETCH_JITTER = (0.5, 2.0)
+
+def _college_key(name: str) -> str:
+    """Dataset key for a college name: its special-case key, else its normalized form."""
+    return _COLLEGE_SPECIAL_CASES.get(name.lower().strip()) or normalize_college_name(name)
+
 def load_college_data() -> dict:
     """Load and cache college data from CSV file."""
     global _college_data
@@ -58,17 +169,26 @@ def load_college_data() -> dict:
     
     colleges = {}
     try:
-        with open(COLLEGE_DATA_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(COLLEGE_DATA_FILE, 'r', encoding='utf-8', newline='') as f:
+            # Plain rows with the two needed columns looked up once from the header
+            reader = csv.reader(f)
+            header = next(reader, [])
+            common_i = header.index('Common name')
+            school_i = header.index('School') if 'School' in header else None
             for row in reader:
-                common_name = row.get('Common name', '').strip()
-                school_name = row.get('School', '').strip()
+                common_name = row[common_i].strip() if common_i < len(row) else ''
+                school_name = row[school_i].strip() if school_i is not None and school_i < len(row) else ''
                 
                 if common_name:
                     # Store both common name and school name as keys
-                    colleges[normalize_college_name(common_name)] = common_name
+                    colleges[_college_key(common_name)] = common_name
                     if school_name and school_name != common_name:
-                        colleges[normalize_college_name(school_name)] = common_name
+                        colleges[_college_key(school_name)] = common_name
+        
+        # Let the special-case spellings hit their school with a plain lookup
+        for alias, key in _COLLEGE_SPECIAL_CASES.items():
+            if key in colleges:
+                colleges[normalize_college_name(alias)] = colleges[key]
         
         print(f"📚 Loaded {len(set(colleges.values()))} unique colleges with {len(colleges)} name variations")
         _college_data = colleges
@@ -79,71 +199,71 @@ def load_college_data() -> dict:
         _college_data = {}
         return {}
 
+# Names that normalize to the wrong key, mapped to the key of the school they
+# mean. Applied once in load_college_data rather than on every lookup
+_COLLEGE_SPECIAL_CASES = {
+    "miami (fl)": "miami",
+    "miami (florida)": "miami",
+    "miami (ohio)": "miami of ohio",
+    "miami (oh)": "miami of ohio",
+    "university of miami": "miami",
+    "university of miami (florida)": "miami",
+    "university of miami (fl)": "miami",
+    "mississippi": "ole miss",
+    "university of mississippi": "ole miss",
+    "sam houston state": "sam houston",
+    "north carolina st.": "nc state",
+    "north carolina state": "nc state"
+}
+
+# Patterns used by normalize_college_name, compiled once (it runs for every
+# dataset row at load and for every scraped college)
+_PUNCT_RE = re.compile(r'[.,\-()\[\]{}]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_PREFIX_RE = re.compile(r'^(university of |college of )')
+# Abbreviations expanded as whole words. The dotted forms ("st.", "univ.")
+# never survive _PUNCT_RE, so only the bare tokens are needed; no expansion
+# contains another token, so one alternation pass equals applying them in turn
+_ABBREVIATIONS = {
+    'st': 'state',
+    'univ': 'university',
+    'col': 'college',
+    'u': 'university',
+    'tech': 'technology',
+    'inst': 'institute',
+    'a&m': 'agricultural and mechanical',
+    'a & m': 'agricultural and mechanical',
+    'unc': 'university of north carolina',
+    'usc': 'university of southern california',
+    'ucla': 'university of california los angeles',
+    'lsu': 'louisiana state university',
+    'tcu': 'texas christian university',
+    'smu': 'southern methodist university',
+    'byu': 'brigham young university',
+}
+_ABBREVIATION_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, sorted(_ABBREVIATIONS, key=len, reverse=True))) + r')\b')
+
+@functools.lru_cache(maxsize=4096)
 def normalize_college_name(name: str) -> str:
-    """Normalize college names for consistent matching with special cases."""
+    """Normalize college names for consistent matching (memoized)."""
     if not name or name.lower().strip() in {"unknown", "none", ""}:
         return ""
     
     # Convert to lowercase and strip
     normalized = name.lower().strip()
     
-    # Handle special cases first (before other normalization)
-    special_cases = {
-        "miami (fl)": "miami",
-        "miami (florida)": "miami", 
-        "miami (ohio)": "miami of ohio",
-        "miami (oh)": "miami of ohio",
-        "university of miami": "miami",
-        "university of miami (florida)": "miami",
-        "university of miami (fl)": "miami",
-        "mississippi": "ole miss",
-        "university of mississippi": "ole miss",
-        "sam houston state": "sam houston",
-        "north carolina st.": "nc state",
-        "north carolina state": "nc state"
-    }
-    
-    if normalized in special_cases:
-        result = special_cases[normalized]
-        print(f"🔄 Special case applied: '{name}' -> '{result}'")
-        return result
-    
     # Remove common punctuation
-    normalized = re.sub(r'[.,\-()\[\]{}]', ' ', normalized)
+    normalized = _PUNCT_RE.sub(' ', normalized)
     
     # Handle common abbreviations
-    abbreviations = {
-        r'\bst\b': 'state',
-        r'\bst\.\b': 'state',
-        r'\buniv\b': 'university',
-        r'\buniv\.\b': 'university',
-        r'\bcol\b': 'college',
-        r'\bcol\.\b': 'college',
-        r'\bu\b': 'university',
-        r'\bu\.\b': 'university',
-        r'\btech\b': 'technology',
-        r'\btech\.\b': 'technology',
-        r'\binst\b': 'institute',
-        r'\binst\.\b': 'institute',
-        r'\ba&m\b': 'agricultural and mechanical',
-        r'\ba & m\b': 'agricultural and mechanical',
-        r'\bunc\b': 'university of north carolina',
-        r'\busc\b': 'university of southern california',
-        r'\bucla\b': 'university of california los angeles',
-        r'\blsu\b': 'louisiana state university',
-        r'\btcu\b': 'texas christian university',
-        r'\bsmu\b': 'southern methodist university',
-        r'\bbyu\b': 'brigham young university',
-    }
-    
-    for abbrev, full in abbreviations.items():
-        normalized = re.sub(abbrev, full, normalized)
+    normalized = _ABBREVIATION_RE.sub(lambda m: _ABBREVIATIONS[m.group(1)], normalized)
     
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
     
     # Remove "university of" and "college of" prefixes for better matching
-    normalized = re.sub(r'^(university of |college of )', '', normalized)
+    normalized = _PREFIX_RE.sub('', normalized)
     
     return normalized
 
@@ -157,10 +277,12 @@ def match_college_name(scraped_name: str, college_data: dict) -> str:
     # Only accept exact matches after normalization
     if normalized_scraped in college_data:
         matched_name = college_data[normalized_scraped]
-        print(f"✅ Exact match: '{scraped_name}' -> '{matched_name}'")
+        if DEBUG:
+            print(f"✅ Exact match: '{scraped_name}' -> '{matched_name}'")
         return matched_name
     
-    print(f"❌ No exact match found for college: '{scraped_name}' (normalized: '{normalized_scraped}')")
+    if DEBUG:
+        print(f"❌ No exact match found for college: '{scraped_name}' (normalized: '{normalized_scraped}')")
     return None
 
 def normalize_pos(position: str) -> str:
@@ -179,52 +301,109 @@ def normalize_pos(position: str) -> str:
     
     return position_map.get(pos, pos)
 
+def _load_player_college_cache() -> dict:
+    """Load previously scraped raw college names keyed by player URL."""
+    if not PLAYER_COLLEGE_DB_PATH.exists():
+        return {}
+    try:
+        conn = sqlite3.connect(PLAYER_COLLEGE_DB_PATH)
+        try:
+            rows = conn.execute("SELECT url, college FROM player_college").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not read player college cache: {e}")
+        return {}
+    return dict(rows)
+
+# A player's college never changes, so each player page only has to be fetched
+# once across quizzes and runs
+_PLAYER_COLLEGE_CACHE = _load_player_college_cache()
+_PLAYER_CACHE_LOCK = threading.Lock()
+
+# College lookups in a player's #meta box, compiled once
+_COLLEGE_LABEL_XPATH = lxml.etree.XPath(".//strong[starts-with(normalize-space(.), 'College')]")
+# Same count of preceding <br> siblings as the label means no <br> in between
+_COLLEGE_LINKS_XPATH = lxml.etree.XPath(
+    "following-sibling::a[count(preceding-sibling::br) = $brs_before]"
+    "[starts-with(@href, '/schools/') and not(contains(@href, 'high_schools'))]"
+)
+
+def _save_player_college(player_url: str, raw_college: str):
+    """Remember a player's scraped college in memory and on disk."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with _PLAYER_CACHE_LOCK:
+            _PLAYER_COLLEGE_CACHE[player_url] = raw_college
+            conn = sqlite3.connect(PLAYER_COLLEGE_DB_PATH)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS player_college ("
+                    "url TEXT PRIMARY KEY, college TEXT, fetched_at REAL)"
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO player_college VALUES (?, ?, ?)",
+                    (player_url, raw_college, time.time()),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not persist player college cache: {e}")
+
+def scrape_player_college(player_url: str, player_name: str) -> str:
+    """Fetch a player's page and return the most recent college listed, or None."""
+    # fetch_html paces requests and backs off when throttled; the short jitter
+    # keeps some headroom under the limiter instead of relying on 429 backoff.
+    # The whole page is read so the keep-alive connection goes back to the pool;
+    # _PLAYER_COLLEGE_CACHE means each player page is only fetched once anyway
+    with _COLLEGE_FETCH_SLOTS:
+        time.sleep(random.uniform(*PLAYER_FETCH_JITTER))
+        html = fetch_html(player_url)
+    tree = lxml.html.fromstring(html)
+    
+    # Find the meta information box
+    meta = tree.get_element_by_id("meta", None)
+    if meta is None:
+        print(f"❌ {player_name}: No meta box found")
+        return None
+    
+    # Look for College label
+    label = next(iter(_COLLEGE_LABEL_XPATH(meta)), None)
+    if label is None:
+        print(f"❌ {player_name}: No College label found")
+        return None
+    
+    # Extract college links: school links after the label, up to the next <br>
+    colleges = [link.text_content().strip() for link in _COLLEGE_LINKS_XPATH(
+        label, brs_before=len(label.xpath("preceding-sibling::br")))]
+    
+    if not colleges:
+        print(f"❌ {player_name}: No college links found")
+        return None
+    
+    return colleges[-1]  # Take the last (most recent) college
+
 def get_college_info(player_url: str, player_name: str, college_data: dict) -> tuple:
     """Scrape college information for a player and match to dataset.
     Returns (matched_college_name, raw_scraped_name) or (None, None) if no match.
     """
     try:
-        time.sleep(random.uniform(8, 12))  # Be very respectful - avoid IP ban
-        
-        req = Request(player_url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read().decode("utf-8")
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Find the meta information box
-        meta = soup.find(id="meta")
-        if not meta:
-            print(f"❌ {player_name}: No meta box found")
-            return None, None
-        
-        # Look for College label
-        label = meta.find("strong", string=lambda s: s and s.strip().startswith("College"))
-        if not label:
-            print(f"❌ {player_name}: No College label found")
-            return None, None
-        
-        # Extract college links
-        colleges = []
-        for node in label.next_siblings:
-            if getattr(node, "name", None) == "br":
-                break
-            if getattr(node, "name", None) == "a":
-                href = node.get("href", "")
-                if href.startswith("/schools/") and "high_schools" not in href:
-                    colleges.append(node.get_text(strip=True))
-        
-        if colleges:
-            raw_college = colleges[-1]  # Take the last (most recent) college
-            matched_college = match_college_name(raw_college, college_data)
-            
-            if matched_college:
-                print(f"✅ {player_name}: {raw_college} -> {matched_college}")
-                return matched_college, raw_college
-            else:
-                print(f"❌ {player_name}: {raw_college} (no dataset match)")
-                return None, raw_college
-        
-        print(f"❌ {player_name}: No college links found")
-        return None, None
+        raw_college = _PLAYER_COLLEGE_CACHE.get(player_url)
+        if raw_college is None:
+            raw_college = scrape_player_college(player_url, player_name)
+            if not raw_college:
+                return None, None
+            _save_player_college(player_url, raw_college)
+        
+        matched_college = match_college_name(raw_college, college_data)
+        
+        if matched_college:
+            print(f"✅ {player_name}: {raw_college} -> {matched_college}")
+            return matched_college, raw_college
+        else:
+            print(f"❌ {player_name}: {raw_college} (no dataset match)")
+            return None, raw_college
         
     except Exception as e:
         print(f"❌ Error fetching college for {player_name}: {e}")
@@ -234,8 +413,10 @@ def scrape_team_games(team: str, season: int) -> list:
     """Scrape all game URLs for a team in a given season."""
     try:
         url = f"{BASE_URL}/teams/{team}/{season}.htm"
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read().decode("utf-8")
+        # Only finished seasons' schedules are safe to cache; a season's playoffs
+        # run into February of the next year, so it counts as finished from March
+        now = datetime.now()
+        html = fetch_html(url, cache=season < now.year - (1 if now.month < 3 else 0))
         
         soup = BeautifulSoup(html, "lxml")
         boxscore_links = soup.select("table#games a[href*='/boxscores/']")
@@ -252,86 +433,69 @@ def scrape_team_games(team: str, season: int) -> list:
         print(f"❌ Error scraping games for {team} {season}: {e}")
         return []
 
-def scrape_starting_lineup(boxscore_url: str, target_team: str) -> tuple:
-    """Scrape starting lineup from a boxscore page for a specific team."""
+# Boxscore URLs end in the home team's code: /boxscores/201511010nor.htm
+_BOXSCORE_HOME_RE = re.compile(r'/\d{9}([a-z]{3})\.htm$')
+_COMMENT_RE = re.compile(r'<!--(.*?)-->', re.DOTALL)
+
+def boxscore_home_team(boxscore_url: str) -> str:
+    """Home team code encoded in a boxscore URL (e.g. "nor"), or "" if it doesn't match."""
+    match = _BOXSCORE_HOME_RE.search(boxscore_url)
+    return match.group(1) if match else ""
+
+def _find_comment(html: str, marker: str) -> str:
+    """Text of the first HTML comment mentioning `marker`, or None."""
+    for comment in _COMMENT_RE.finditer(html):
+        if marker in comment.group(1):
+            return comment.group(1)
+    return None
+
+def scrape_starting_lineup(boxscore_url: str, target_team: str, is_target_home: bool = None) -> tuple:
+    """Scrape starting lineup from a boxscore page for a specific team.
+    is_target_home is taken from the URL when not given.
+    """
     try:
-        req = Request(boxscore_url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read().decode("utf-8")
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Extract team abbreviation from URL
-        # URL format: /boxscores/201511010nor.htm - extract "nor"
-        url_parts = boxscore_url.split('/')
-        if len(url_parts) > 0:
-            filename = url_parts[-1]  # "201511010nor.htm"
-            # Extract team from end of filename (last 3 chars before .htm)
-            team_from_url = filename.replace('.htm', '')[-3:]
-            print(f"🔍 URL team: {team_from_url}, Target team: {target_team}")
-        
-        # Look for both home_starters and vis_starters tables in comments
-        comments = soup.find_all(string=lambda t: isinstance(t, Comment))
-        starters_html = None
-        table_id = None
-        
-        # Determine if target team is home or visitor based on URL
-        # URL format: /boxscores/201512130tam.htm means TAM is home team
-        is_target_home = (team_from_url.lower() == target_team.lower())
-        
-        if is_target_home:
-            # Target team is home team, look for home_starters
-            for comment in comments:
-                if "home_starters" in comment:
-                    starters_html = comment
-                    table_id = "home_starters"
-                    print(f"✅ Found {target_team} as home team (from URL)")
-                    break
+        html = fetch_html(boxscore_url, cache=True)
+        
+        if is_target_home is None:
+            is_target_home = boxscore_home_team(boxscore_url) == target_team.lower()
+        
+        # The starters tables ship inside HTML comments; look in the comment
+        # for the target's side first and only search for the other on a miss
+        table_id = "home_starters" if is_target_home else "vis_starters"
+        starters_html = _find_comment(html, table_id)
+        if starters_html:
+            side = "home" if is_target_home else "visiting"
+            print(f"✅ Found {target_team} as {side} team (from URL)")
         else:
-            # Target team is visiting team, look for vis_starters
-            for comment in comments:
-                if "vis_starters" in comment:
-                    starters_html = comment
-                    table_id = "vis_starters"
-                    print(f"✅ Found {target_team} as visiting team (from URL)")
-                    break
-        
-        # Fallback: if we didn't find the expected table, try the other one
-        if not starters_html:
+            # Fallback: if we didn't find the expected table, try the other one
             print(f"⚠️ Expected table not found, trying fallback...")
-            for comment in comments:
-                if "home_starters" in comment and not is_target_home:
-                    starters_html = comment
-                    table_id = "home_starters"
-                    print(f"🔄 Fallback: trying home_starters table")
-                    break
-                elif "vis_starters" in comment and is_target_home:
-                    starters_html = comment
-                    table_id = "vis_starters" 
-                    print(f"🔄 Fallback: trying vis_starters table")
-                    break
+            table_id = "vis_starters" if is_target_home else "home_starters"
+            starters_html = _find_comment(html, table_id)
+            if starters_html:
+                print(f"🔄 Fallback: trying {table_id} table")
         
         if not starters_html:
             print(f"❌ No starters table found for {target_team}")
             return None, None
         
-        # Parse the starting lineup table
-        starters_df = pd.read_html(StringIO(starters_html), header=0, attrs={"id": table_id})[0]
-        soup_table = BeautifulSoup(starters_html, "lxml")
-        
-        # Extract player names and links
-        player_links = soup_table.select(f"table#{table_id} th[data-stat='player'] a")
+        # Parse the starting lineup table once; each row carries both the
+        # player link and the position, so they can't drift out of step
+        table = lxml.html.fromstring(starters_html)
+        if table.get("id") != table_id:
+            table = table.get_element_by_id(table_id)
         
         players = []
-        for i, link in enumerate(player_links):
-            if i >= len(starters_df):
-                break
-                
-            player_name = link.get_text(strip=True)
-            player_href = link["href"]
+        for row in table.iter("tr"):
+            link = row.find("th[@data-stat='player']/a")
+            if link is None:
+                continue
+            
+            player_name = link.text_content().strip()
+            player_href = link.get("href")
             player_url = BASE_URL + player_href
             
-            # Get position from dataframe
-            row = starters_df.iloc[i]
-            position = normalize_pos(str(row.get("Pos", "")))
+            pos_cell = row.find("td[@data-stat='pos']")
+            position = normalize_pos(pos_cell.text_content() if pos_cell is not None else "")
             
             # Only include offensive players
             if position in OFFENSIVE_POSITIONS:
@@ -423,15 +587,33 @@ def generate_nfl_quiz_for_team_season(team: str, season: int, save_dir: str) ->
     # Try random games until we find a valid starting lineup
     random.shuffle(boxscore_urls)
     
+    # Once a boxscore has been rejected, the next few are fetched ahead into the
+    # page cache (paced by the shared rate limiter), so later candidates are
+    # usually already on disk. The first game is fetched alone, since a college
+    # mismatch abandons the team/season and any prefetch would be wasted
+    prefetched = {}
+    try:
+        return _try_boxscores(team, season, boxscore_urls, college_data, prefetched)
+    finally:
+        for future in prefetched.values():
+            future.cancel()
+
+def _try_boxscores(team: str, season: int, boxscore_urls: list, college_data: dict, prefetched: dict) -> tuple:
+    """Walk shuffled boxscores until one yields a fully college-matched lineup."""
     for i, boxscore_url in enumerate(boxscore_urls):
         print(f"🎯 Trying game: {boxscore_url}")
         
-        # Add respectful delay between requests (except for first attempt)
-        if i > 0:
-            print("⏳ Waiting 10 seconds to be respectful to pro-football-reference...")
-            time.sleep(10)
-        
-        players, game_url = scrape_starting_lineup(boxscore_url, team)
+        if i > 0:  # Previous game was rejected before the college check
+            for j in range(max(i, max(prefetched, default=0) + 1), min(i + BOXSCORE_PREFETCH, len(boxscore_urls))):
+                prefetched[j] = _BOXSCORE_POOL.submit(fetch_html, boxscore_urls[j], True)
+        if i in prefetched:
+            try:
+                prefetched[i].result()
+            except Exception:
+                pass  # scrape_starting_lineup fetches it again and reports the error
+        
+        players, game_url = scrape_starting_lineup(
+            boxscore_url, team, is_target_home=boxscore_home_team(boxscore_url) == team.lower())
         if not players:
             print(f"⚠️  No players found, trying next game")
             continue
@@ -439,8 +621,9 @@ def generate_nfl_quiz_for_team_season(team: str, season: int, save_dir: str) ->
         print(f"👥 Found {len(players)} offensive players")
         
         # DEBUG: Show actual positions found
-        positions_found = [f"{player['name']} ({player['position']})" for player in players]
-        print(f"🔍 Positions scraped: {', '.join(positions_found)}")
+        if DEBUG:
+            positions_found = [f"{player['name']} ({player['position']})" for player in players]
+            print(f"🔍 Positions scraped: {', '.join(positions_found)}")
         
         # Build formation - focus on skill positions
         formation = build_formation(players)
@@ -452,14 +635,17 @@ def generate_nfl_quiz_for_team_season(team: str, season: int, save_dir: str) ->
             print(f"⚠️  Incomplete skill lineup ({len(formation['order'])} players), trying next game")
             continue
         
-        # Fetch college information for each player - require 100% match
+        # Fetch college information for each player - require 100% match.
+        # Lookups overlap (see _COLLEGE_FETCH_SLOTS); results keep formation order
         quiz_players = []
         failed_matches = []
         
-        for pos in formation["order"]:
-            player = formation["by_pos"][pos]
-            matched_college, raw_college = get_college_info(player["url"], player["name"], college_data)
-            
+        lineup = [formation["by_pos"][pos] for pos in formation["order"]]
+        with ThreadPoolExecutor(max_workers=len(lineup)) as pool:
+            college_infos = list(pool.map(
+                lambda player: get_college_info(player["url"], player["name"], college_data), lineup))
+        
+        for pos, player, (matched_college, raw_college) in zip(formation["order"], lineup, college_infos):
             if matched_college:
                 quiz_players.append({
                     "name": player["name"],
@@ -527,11 +713,20 @@ def generate_nfl_quiz(team: str = None, season: int = None, save_dir: str = "qui
             save_path = Path(save_dir)
             save_path.mkdir(parents=True, exist_ok=True)
             
-            filename = f"players_{quiz_data['generated_at']}.json"
-            file_path = save_path / filename
+            # Quizzes generated in parallel can finish within the same second;
+            # exclusive create picks the next free name instead of overwriting
+            suffix = 0
+            while True:
+                filename = f"players_{quiz_data['generated_at']}{f'_{suffix}' if suffix else ''}.json"
+                file_path = save_path / filename
+                try:
+                    f = file_path.open("xb")
+                    break
+                except FileExistsError:
+                    suffix += 1
             
-            with file_path.open("w", encoding="utf-8") as f:
-                json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+            with f:
+                f.write(quiz_json_bytes(quiz_data))
             
             print(f"✅ Saved NFL quiz: {file_path}")
             print(f"📊 Quiz contains {len(quiz_data['players'])} players")
@@ -544,23 +739,42 @@ def generate_nfl_quiz(team: str = None, season: int = None, save_dir: str = "qui
     print(f"❌ Could not generate valid quiz after {max_attempts} attempts")
     return False
 
-def generate_multiple_nfl_quizzes(count: int = 5, save_dir: str = "quizzes/gridiron11/preloaded"):
-    """Generate multiple NFL quizzes."""
-    print(f"🚀 Generating {count} NFL quizzes...")
+def generate_multiple_nfl_quizzes(count: int = 5, save_dir: str = "quizzes/gridiron11/preloaded", workers: int = 3):
+    """Generate multiple NFL quizzes, several at a time.
+    Each quiz targets a different team/season; all of them share the request rate limit.
+    """
+    print(f"🚀 Generating {count} NFL quizzes ({workers} at a time)...")
     
     generated = 0
     attempts = 0
+    in_flight = 0
     max_attempts = count * 3  # Allow some failures
+    lock = threading.Lock()
+    
+    def worker():
+        nonlocal generated, attempts, in_flight
+        while True:
+            with lock:
+                # Don't start more attempts than quizzes still needed
+                if generated + in_flight >= count or attempts >= max_attempts:
+                    return
+                attempts += 1
+                in_flight += 1
+                print(f"\n--- Attempt {attempts}/{max_attempts} (Generated: {generated}/{count}) ---")
+            
+            success = generate_nfl_quiz(save_dir=save_dir)
+            with lock:
+                in_flight -= 1
+                if success:
+                    generated += 1
+            
+            # Longer delay between generations to avoid rate limiting
+            time.sleep(10)
     
-    while generated < count and attempts < max_attempts:
-        attempts += 1
-        print(f"\n--- Attempt {attempts}/{max_attempts} (Generated: {generated}/{count}) ---")
-        
-        if generate_nfl_quiz(save_dir=save_dir):
-            generated += 1
-        
-        # Longer delay between generations to avoid rate limiting
-        time.sleep(10)
+    workers = max(1, min(workers, count))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
     
     print(f"\n🎯 Generation complete: {generated}/{count} quizzes created")
 
@@ -599,8 +813,8 @@ def manually_assign_sprites(quiz_file_path: str):
                     print(f"   ❌ Invalid input. Enter a number between 1-10.")
         
         # Save updated quiz
-        with open(quiz_file_path, 'w') as f:
-            json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+        with open(quiz_file_path, 'wb') as f:
+            f.write(quiz_json_bytes(quiz_data))
         
         print(f"\n✅ Sprite assignments saved to {quiz_file_path}")
         
@@ -614,6 +828,8 @@ def main():
     parser.add_argument("--season", type=int, help="Specific season year (e.g., 2023)")
     parser.add_argument("--save-dir", type=str, default="quizzes/gridiron11/preloaded", 
                        help="Directory to save quiz files")
+    parser.add_argument("--workers", type=int, default=3,
+                       help="Quizzes to generate concurrently")
     parser.add_argument("--assign-sprites", "-a", type=str,
                        help="Manually assign sprites to players in a quiz file")
     
@@ -630,7 +846,7 @@ def main():
         generate_nfl_quiz(args.team, args.season, args.save_dir)
     else:
         # Generate multiple random quizzes
-        generate_multiple_nfl_quizzes(args.count, args.save_dir)
+        generate_multiple_nfl_quizzes(args.count, args.save_dir, args.workers)
 
 if __name__ == "__main__":
     main()
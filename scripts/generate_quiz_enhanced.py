@@ -42,7 +42,7 @@ from nba_api.stats.endpoints import (
 )
 
 # NFL imports
-from urllib.request import Request, urlopen
+import requests
 from bs4 import BeautifulSoup, Comment
 from io import StringIO
 
@@ -116,12 +116,18 @@ def match_college_to_conf(school_raw: str):
         return school_raw, "International", "Other", 0
     return school_raw, "Other", "Other", 0
 
+# Lowercase full name -> player record, built once instead of scanning the
+# whole player list on every lookup (first record wins for duplicate names)
+_players_by_name = {}
+for _p in players.get_players():
+    _players_by_name.setdefault(_p["full_name"].lower(), _p)
+
 def get_college_info(player_name: str):
-    match = [p for p in players.get_players() if p["full_name"].lower() == player_name.lower()]
+    match = _players_by_name.get(player_name.lower())
     if not match:
         return "Unknown", "Other", "Other", None, "Unknown", "Unknown", 0
 
-    player_id = match[0]["id"]
+    player_id = match["id"]
     time.sleep(0.6)
     info_df = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
     school_raw = info_df.iloc[0].get("SCHOOL", "Unknown")
@@ -330,6 +336,16 @@ SKILL_POSITIONS = ["QB", "RB", "WR", "TE"]
 OFFENSIVE_POSITIONS = set(SKILL_POSITIONS)
 BASE_URL = "https://www.pro-football-reference.com"
 
+# One keep-alive session for every Pro Football Reference request, so only the
+# first fetch pays for the TCP/TLS handshake
+_PFR_SESSION = requests.Session()
+_PFR_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+
+def _fetch_pfr_html(url: str) -> str:
+    response = _PFR_SESSION.get(url, timeout=15)
+    response.raise_for_status()
+    return response.text
+
 # Path to college dataset for NFL
 NFL_COLLEGE_DATA_FILE = "app/gridiron11/CFB/cbb25.csv"
 
@@ -435,8 +451,7 @@ def get_nfl_college_info(player_url: str, player_name: str) -> str:
     try:
         time.sleep(random.uniform(2, 4))
         
-        req = Request(player_url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read().decode("utf-8")
+        html = _fetch_pfr_html(player_url)
         soup = BeautifulSoup(html, "lxml")
         
         meta = soup.find(id="meta")
@@ -484,8 +499,7 @@ def scrape_nfl_team_games(team: str, season: int) -> list:
     """Scrape all game URLs for an NFL team in a given season."""
     try:
         url = f"{BASE_URL}/teams/{team}/{season}.htm"
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read().decode("utf-8")
+        html = _fetch_pfr_html(url)
         
         soup = BeautifulSoup(html, "lxml")
         boxscore_links = soup.select("table#games a[href*='/boxscores/']")
@@ -505,8 +519,7 @@ def scrape_nfl_team_games(team: str, season: int) -> list:
 def scrape_nfl_starting_lineup(boxscore_url: str, target_team: str) -> tuple:
     """Scrape starting lineup from an NFL boxscore page for a specific team."""
     try:
-        req = Request(boxscore_url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read().decode("utf-8")
+        html = _fetch_pfr_html(boxscore_url)
         soup = BeautifulSoup(html, "lxml")
         
         # Extract team abbreviation from URL
@@ -3,17 +3,17 @@ Complete Creator System: SQLite Auth + CSV Ballot Storage
 Best of both worlds: Secure user management + Simple ballot storage
 """
 
-from creator_auth_system import CreatorAuthSystem, login_required, admin_required
+from creator_auth_system import get_auth_system, login_required, admin_required, load_secret_key
 from csv_ballot_storage import CSVBallotStorage
 from flask import Flask, request, session, render_template, redirect, url_for, flash, jsonify
 import os
 from datetime import datetime
 
 app = Flask(__name__)
-app.secret_key = 'change-this-to-a-secure-secret-key'
+app.secret_key = load_secret_key()
 
-# Initialize systems
-auth_system = CreatorAuthSystem("creator_poll_db.db")
+# Initialize systems (the auth database is opened lazily by get_auth_system)
+AUTH_DB_PATH = "creator_poll_db.db"
 ballot_storage = CSVBallotStorage("creator_ballots")
 
 def get_current_poll_info():
@@ -105,7 +105,7 @@ def creator_register():
         elif len(password) < 8:
             flash('Password must be at least 8 characters.', 'error')
         else:
-            success = auth_system.create_creator(username, email, password, display_name, bio, twitter_handle)
+            success = get_auth_system(AUTH_DB_PATH).create_creator(username, email, password, display_name, bio, twitter_handle)
             if success:
                 flash('Registration successful! Please log in.', 'success')
                 return redirect(url_for('creator_login'))
@@ -161,7 +161,7 @@ def creator_login():
         username = request.form.get('username')
         password = request.form.get('password')
         
-        auth_result = auth_system.authenticate_creator(
+        auth_result = get_auth_system(AUTH_DB_PATH).authenticate_creator(
             username, password, 
             request.remote_addr, 
             request.headers.get('User-Agent', '')
@@ -243,7 +243,7 @@ def creator_vote():
             
             if success:
                 # Record participation
-                auth_system.record_ballot_submission(creator_id, poll_info["season"], poll_info["week"])
+                get_auth_system(AUTH_DB_PATH).record_ballot_submission(creator_id, poll_info["season"], poll_info["week"])
                 flash('Your ballot has been submitted successfully!', 'success')
                 return redirect(url_for('creator_dashboard'))
             else:
@@ -325,7 +325,7 @@ def creator_vote():
 def creator_dashboard():
     """Creator dashboard"""
     creator_id = session.get('creator_id')
-    profile = auth_system.get_creator_profile(creator_id)
+    profile = get_auth_system(AUTH_DB_PATH).get_creator_profile(creator_id)
     poll_info = get_current_poll_info()
     
     # Check if creator has voted this week
@@ -396,7 +396,7 @@ def creator_logout():
     """Creator logout"""
     session_id = session.get('creator_session_id')
     if session_id:
-        auth_system.logout_creator(session_id)
+        get_auth_system(AUTH_DB_PATH).logout_creator(session_id)
     
     session.clear()
     flash('You have been logged out.', 'info')
@@ -470,7 +470,7 @@ if __name__ == '__main__':
     print("🚀 Setting up Creator Poll System...")
     
     # Create sample creators
-    auth_system.create_creator(
+    get_auth_system(AUTH_DB_PATH).create_creator(
         username="coach_brown",
         email="coach@cfb.com", 
         password="password123",
@@ -479,7 +479,7 @@ if __name__ == '__main__':
         twitter_handle="@coachbrown"
     )
     
-    auth_system.create_creator(
+    get_auth_system(AUTH_DB_PATH).create_creator(
         username="cfb_writer",
         email="writer@sports.com",
         password="password123",
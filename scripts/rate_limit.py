@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Request pacing shared by the quiz generators
+
+TokenBucket paces calls to an external site across threads. PFR_LIMITER is
+the one pro-football-reference.com bucket that auto_generate_quiz.py and
+generate_nfl_quiz.py both draw from.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per `per` seconds."""
+
+    def __init__(self, rate: float, per: float):
+        self.rate = rate
+        self.per = per
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.rate / self.per
+                self._tokens = min(self.rate, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.per / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds` (e.g. after the server throttles us)."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0) - seconds * self.rate / self.per
+
+
+# Pro Football Reference bans clients above 20 requests/minute. Stay at 15/minute
+# (one request every 4 seconds) so parallel quiz workers never reach the limit
+PFR_LIMITER = TokenBucket(rate=1, per=4.0)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3.10
+"""
+WSGI entry point for the creator poll system (SQLite auth + CSV ballots).
+
+Serve it with a threaded gunicorn worker instead of Flask's dev server, so
+password hashing and SQLite calls from one request don't hold up the rest:
+
+    cd scripts
+    gunicorn -k gthread -w 2 --threads 16 wsgi_creator_system:application
+
+Set SECRET_KEY so every worker signs session cookies with the same key, and
+CREATOR_SESSION_REDIS_URL to share login sessions between workers.
+"""
+
+import os
+import sys
+import logging
+
+# Make the sibling creator modules importable regardless of the working directory
+path = os.path.dirname(os.path.abspath(__file__))
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+
+try:
+    from integrated_creator_system import app as application
+    logging.info("Creator poll system loaded successfully")
+except Exception as e:
+    logging.error(f"Error loading creator poll system: {e}")
+    raise
+
+if __name__ == "__main__":
+    application.run()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSONL ballot storage: concurrency, compaction and migration
+"""
+
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Add scripts directory to path
+scripts_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "scripts")
+sys.path.insert(0, scripts_dir)
+
+from ballot_storage import BallotStorage
+
+
+def test_concurrent_saves():
+    """Every user's ballot reads back after many simultaneous saves to one poll"""
+    with tempfile.TemporaryDirectory() as storage_dir:
+        storage = BallotStorage(storage_dir)
+        users = [f"user_{i}" for i in range(50)]
+
+        def submit(user_id):
+            ballot = [{"rank": 1, "team_name": user_id, "team_id": "1", "reasoning": ""}]
+            return storage.save_ballot(2025, 3, user_id, ballot)
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            assert all(pool.map(submit, users))
+
+        for user_id in users:
+            ballot = storage.load_ballot(2025, 3, user_id)
+            assert ballot is not None, f"Lost ballot for {user_id}"
+            assert ballot["ballot"][0]["team_name"] == user_id
+
+        assert storage.get_poll_stats(2025, 3)["total_ballots"] == len(users)
+
+        leftovers = [name for name in os.listdir(storage.get_poll_dir(2025, 3)) if name.endswith(".tmp")]
+        assert not leftovers, f"Temporary index files left behind: {leftovers}"
+
+        print(f"✅ All {len(users)} concurrent ballots saved and read back")
+
+
+def test_resubmissions_are_compacted():
+    """Repeated resubmissions keep ballots.jsonl near one line per user"""
+    with tempfile.TemporaryDirectory() as storage_dir:
+        storage = BallotStorage(storage_dir)
+        storage.COMPACT_MIN_BYTES = 1024
+        users = [f"user_{i}" for i in range(5)]
+
+        for round_number in range(100):
+            for user_id in users:
+                ballot = [{"rank": 1, "team_name": f"{user_id} round {round_number}", "team_id": "1", "reasoning": ""}]
+                assert storage.save_ballot(2025, 3, user_id, ballot)
+
+        poll_dir = storage.get_poll_dir(2025, 3)
+        index = storage.load_index(poll_dir)
+        live_bytes = sum(entry["length"] for entry in index.values())
+        file_size = os.path.getsize(os.path.join(poll_dir, storage.BALLOTS_FILE))
+        # Without compaction the file would hold all 500 submissions
+        assert file_size < 2 * live_bytes + storage.COMPACT_MIN_BYTES
+
+        for user_id in users:
+            ballot = storage.load_ballot(2025, 3, user_id)
+            assert ballot["ballot"][0]["team_name"] == f"{user_id} round 99"
+        assert len(storage.get_all_ballots(2025, 3)) == len(users)
+
+        print(f"✅ ballots.jsonl compacted to {file_size} bytes for {len(users)} users")
+
+
+def test_legacy_migration_runs_once():
+    """Legacy per-user files are migrated on first start, then the scan is skipped"""
+    with tempfile.TemporaryDirectory() as storage_dir:
+        poll_dir = os.path.join(storage_dir, "season_2025", "week_3")
+        os.makedirs(poll_dir)
+        with open(os.path.join(poll_dir, "user_alice.json"), "w") as f:
+            json.dump({"user_id": "alice", "user_type": "registered", "ballot": [],
+                       "submitted_at": "2025-09-01T00:00:00", "ballot_id": "legacy-1"}, f)
+
+        storage = BallotStorage(storage_dir)
+        assert storage.load_ballot(2025, 3, "alice")["ballot_id"] == "legacy-1"
+        assert os.path.exists(os.path.join(storage_dir, BallotStorage.MIGRATION_MARKER))
+
+        # A second start doesn't rescan the poll directories
+        with open(os.path.join(poll_dir, "user_bob.json"), "w") as f:
+            json.dump({"ballot_id": "legacy-2"}, f)
+        BallotStorage(storage_dir)
+        assert storage.load_ballot(2025, 3, "bob") is None
+
+        print("✅ Legacy ballots migrated once")
+
+
+if __name__ == "__main__":
+    test_concurrent_saves()
+    test_resubmissions_are_compacted()
+    test_legacy_migration_runs_once()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Check that the college-name cleaners match the original .replace() chains
+"""
+
+import os
+import re
+import sys
+
+# Add scripts directory to path
+scripts_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "scripts")
+sys.path.insert(0, scripts_dir)
+
+from auto_generate_quiz import _NFL_COLLEGE_SPECIAL_CASES, clean_name, normalize_nfl_college_name
+
+# Inputs where substitutions share text or one creates the next one's match
+OVERLAPPING_NAMES = [
+    "st at ohio",
+    "at at at",
+    "the the university of ohio",
+    "State University of New York at Buffalo",
+    "Ohio St. at the university",
+    "univ. of st. thomas",
+    "st st. state. state",
+    "Texas A&M University-Commerce",
+    "Miami (Ohio)",
+    "Penn St",
+    "the st at the",
+    "university of university of texas",
+    "",
+]
+
+
+def original_clean_name(name):
+    """clean_name as it was before the substitutions were tabled"""
+    if not isinstance(name, str):
+        return ""
+    cleaned = (
+        name.lower()
+        .replace("university of ", "")
+        .replace("univ. of ", "")
+        .replace("state university", "state")
+        .replace("university", "")
+        .replace(" at ", " ")
+        .replace("the ", "")
+        .replace("st.", "state")
+        .replace("st ", "state ")
+        .replace("state.", "state")
+        .replace("-", " ")
+        .replace(".", "")
+        .replace("(", "")
+        .replace(")", "")
+    )
+    return re.sub(r"\s+", " ", cleaned).strip()
+
+
+def original_normalize_nfl_college_name(name):
+    """normalize_nfl_college_name as it was before it shared clean_name"""
+    if not name or name.lower().strip() in {"unknown", "none", ""}:
+        return ""
+    
+    normalized = name.lower().strip()
+    
+    special_cases = {
+        "miami (fl)": "miami",
+        "miami (florida)": "miami",
+        "miami (ohio)": "miami of ohio",
+        "miami (oh)": "miami of ohio",
+        "university of miami": "miami",
+        "mississippi": "ole miss",
+        "university of mississippi": "ole miss",
+        "north carolina st.": "nc state",
+        "north carolina state": "nc state",
+        "sam houston state": "sam houston"
+    }
+    
+    if normalized in special_cases:
+        return special_cases[normalized]
+    
+    normalized = (normalized
+                 .replace("university of ", "")
+                 .replace("univ. of ", "")
+                 .replace("state university", "state")
+                 .replace("university", "")
+                 .replace(" at ", " ")
+                 .replace("the ", "")
+                 .replace("st.", "state")
+                 .replace("st ", "state ")
+                 .replace("-", " ")
+                 .replace(".", "")
+                 .replace("(", "")
+                 .replace(")", ""))
+    
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+def test_clean_name_matches_original():
+    """clean_name gives the same output as the original chain on overlapping inputs"""
+    for name in OVERLAPPING_NAMES + [None, 42]:
+        assert clean_name(name) == original_clean_name(name), name
+    print(f"✅ clean_name matches the original chain on {len(OVERLAPPING_NAMES)} names")
+
+
+def test_nfl_normalizer_matches_original():
+    """normalize_nfl_college_name gives the same output as the original NFL chain"""
+    names = OVERLAPPING_NAMES + list(_NFL_COLLEGE_SPECIAL_CASES) + [
+        "Unknown", "None", "  North Carolina St.  ", "Ohio State.", "state.st.", None,
+    ]
+    for name in names:
+        assert normalize_nfl_college_name(name) == original_normalize_nfl_college_name(name), name
+    print(f"✅ normalize_nfl_college_name matches the original chain on {len(names)} names")
+
+
+if __name__ == "__main__":
+    test_clean_name_matches_original()
+    test_nfl_normalizer_matches_original()